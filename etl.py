@@ -6,25 +6,34 @@ import argparse
 from ingestion.ingestion_mediator import IngestionMediator
 from utils.utils import SOURCES
 
-MEDIATOR = IngestionMediator()
-
 
 def main(args):
+    # Workflow step's modules are imported by the mediator on first use
+    mediator = IngestionMediator(manifest_backend=args.manifest_backend)
+
     # Collect bike product raw data and optionally specifications data
     if args.ETL == 'collect':
-        MEDIATOR.collect_sources(sources=args.sources,
+        mediator.collect_sources(sources=args.sources,
                                  get_specs=args.get_specs,
-                                 skip_failed=args.skip_failed)
+                                 skip_failed=args.skip_failed,
+                                 incremental=args.incremental,
+                                 resume=args.resume,
+                                 workers=args.workers)
 
     # Extract specs for given source products.
     if args.ETL == 'extract':
         for source in args.sources:
-            MEDIATOR.extract_specs(source=source)
+            mediator.extract_specs(source=source,
+                                   incremental=args.incremental,
+                                   resume=args.resume)
 
     # Transform raw data files
     if args.ETL == 'clean':
         for source in args.sources:
-            MEDIATOR.transform_raw_data(source=source, bike_type='all')
+            if args.to_db:
+                mediator.load_munged_data(source=source, bike_type='all')
+            else:
+                mediator.transform_raw_data(source=source, bike_type='all')
 
 
 if __name__ == '__main__':
@@ -39,4 +48,18 @@ if __name__ == '__main__':
     parser.add_argument('-e', action='store_false', dest='skip_failed',
                         default=True,
                         help='Raise errors and don\'t skip failed processes.')
+    parser.add_argument('-i', action='store_true', dest='incremental',
+                        default=False,
+                        help='Only fetch specs for new or changed products.')
+    parser.add_argument('-r', action='store_true', dest='resume',
+                        default=False,
+                        help='Resume interrupted specs crawls from checkpoint.')
+    parser.add_argument('-w', type=int, dest='workers', default=1,
+                        help='Number of sources to collect in parallel.')
+    parser.add_argument('-db', action='store_true', dest='to_db',
+                        default=False,
+                        help='Load cleaned data straight into the database.')
+    parser.add_argument('-m', choices=['csv', 'sqlite'], dest='manifest_backend',
+                        default='csv',
+                        help='Store manifests in csv files or a SQLite database.')
     main(args=parser.parse_args())
@@ -239,6 +239,7 @@ class Cleaner(object):
         }
         # add GROUPSET_RANKING keys to GROUPSETS_MAP
         self._GROUPSETS_MAP.update({k: k for k in self._GROUPSET_RANKING.keys()})
+        self._groupset_matcher = None  # compiled from _GROUPSETS_MAP on use
         self._BIKE_TYPE = {  # order matters for fork, frame, kid, girl, and bmx as qualifiers
             'frame', 'frameset', 'fork', 'kid', 'girl', 'e-bike', 'electric',
             'folding', 'balance', 'push', 'trailer', 'boy', 'bmx', 'city',
@@ -459,29 +460,50 @@ class Cleaner(object):
 
         return material.apply(material_replace)
 
-    def _parse_groupset(self, desc: pd.Series) -> pd.Series:
-        """Return matched groupset types."""
+    def _get_groupset_matcher(self) -> tuple:
+        """Return (pattern, groupsets) compiled from _GROUPSETS_MAP.
 
-        def groupset_replace(d, return_desc=True):
-            # Skip np.NaN
-            if not isinstance(d, str) and math.isnan(d):
-                return d
-            else:  # initial value normalization
-                # remove ','
-                d = d.replace(',', '').lower()
-                # fix known systematic typos
-                d = d.replace('shiimano', 'shimano')
-                # remove groupset speed references
-                d = re.sub(r'[0-9]+[\-\w]?sp\w*\s*', repl='', string=d)
+        pattern finds, at every position of a lowercase value, the groupset
+        key starting there that comes first in _GROUPSETS_MAP, so a single
+        scan finds all matched keys. groupsets maps each lowercase key to its
+        (order in map, groupset).
+        """
+        if self._groupset_matcher is None:
+            groupsets = dict()
+            for i, (key, groupset) in enumerate(self._GROUPSETS_MAP.items()):
+                groupsets.setdefault(key.lower(), (i, groupset))
 
-            try:
-                for groupset in self._GROUPSETS_MAP:
-                    # Regex matching
-                    if re.search(re.escape(groupset), d, re.IGNORECASE):
-                        return self._GROUPSETS_MAP[groupset]
-            except AttributeError:
-                pass
-            return d if return_desc else np.NaN
+            pattern = re.compile('(?=(%s))' % '|'.join(
+                re.escape(key) for key in groupsets))
+            self._groupset_matcher = pattern, groupsets
+
+        return self._groupset_matcher
+
+    def _match_groupsets(self, desc: pd.Series) -> pd.Series:
+        """Return groupset of the first _GROUPSETS_MAP key found in each
+        value, NaN if none found.
+
+        Each distinct value is normalized and scanned once by one compiled
+        pattern instead of a regex search per key.
+        """
+        pattern, groupsets = self._get_groupset_matcher()
+        speed_re = re.compile(r'[0-9]+[\-\w]?sp\w*\s*')
+
+        matched = dict()
+        for d in desc.dropna().unique():
+            # initial value normalization: remove ',', fix known systematic
+            # typos and remove groupset speed references
+            value = d.replace(',', '').lower().replace('shiimano', 'shimano')
+            value = speed_re.sub('', value)
+
+            keys = pattern.findall(value)
+            if keys:
+                matched[d] = min(groupsets[key] for key in keys)[1]
+
+        return desc.map(matched)
+
+    def _parse_groupset(self, desc: pd.Series) -> pd.Series:
+        """Return matched groupset types."""
 
         def brand_replace(d, return_desc=True):
             """Match for specific brands"""
@@ -502,7 +524,7 @@ class Cleaner(object):
             return d if return_desc else np.NaN
 
         # First parse from values
-        parsed = desc.apply(groupset_replace, return_desc=False)
+        parsed = self._match_groupsets(desc)
 
         # Second pass, fillnas when possible using specific logic
         for idx in parsed[parsed.isnull()].index:
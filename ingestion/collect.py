@@ -1,25 +1,8 @@
 """Module for scraping websites to collect raw data."""
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
-from scrapers.backcountry import BackCountry
-from scrapers.bike_doctor import BikeDoctor
-from scrapers.bicycle_warehouse import BicycleWarehouse
-from scrapers.canyon import Canyon
-from scrapers.citybikes import CityBikes
-from scrapers.competitive_cyclist import CompetitiveCyclist
-from scrapers.contebikes import ConteBikes
-from scrapers.eriks import EriksBikes
-from scrapers.giant import Giant
-from scrapers.jenson import Jenson
-from scrapers.litespeed import LiteSpeed
-from scrapers.lynskey import Lynskey
-from scrapers.nashbar import NashBar
-from scrapers.proshop import Proshop
-from scrapers.rei import Rei
-from scrapers.specialized import Specialized
-from scrapers.spokes import Spokes
-from scrapers.trek import Trek
-from scrapers.wiggle import Wiggle
-
+from scrapers.registry import get_scraper_class
 from utils.utils import RAW_DATA_PATH, SOURCES, SOURCES_EXCLUDE
 
 
@@ -31,110 +14,138 @@ class Collect:
         self._save_data_path = save_data_path
         self._sources = SOURCES
         self._sources_exclude = SOURCES_EXCLUDE
+        self._manifest_lock = threading.Lock()
 
     def _get_class_instance(self, source: str):
         """Get appropriate scraper class instance for given source."""
-        if source == 'competitive':
-            return CompetitiveCyclist(save_data_path=self._save_data_path)
-        elif source == 'nashbar':
-            return NashBar(save_data_path=self._save_data_path)
-        elif source == 'wiggle':
-            return Wiggle(save_data_path=self._save_data_path)
-        elif source == 'rei':
-            return Rei(save_data_path=self._save_data_path)
-        elif source == 'citybikes':
-            return CityBikes(save_data_path=self._save_data_path)
-        elif source == 'contebikes':
-            return ConteBikes(save_data_path=self._save_data_path)
-        elif source == 'proshop':
-            return Proshop(save_data_path=self._save_data_path)
-        elif source == 'eriks':
-            return EriksBikes(save_data_path=self._save_data_path)
-        elif source == 'specialized':
-            return Specialized(save_data_path=self._save_data_path)
-        elif source == 'trek':
-            return Trek(save_data_path=self._save_data_path)
-        elif source == 'canyon':
-            return Canyon(save_data_path=self._save_data_path)
-        elif source == 'bike_doctor':
-            return BikeDoctor(save_data_path=self._save_data_path)
-        elif source == 'giant':
-            return Giant(save_data_path=self._save_data_path)
-        elif source == 'bicycle_warehouse':
-            return BicycleWarehouse(save_data_path=self._save_data_path)
-        elif source == 'litespeed':
-            return LiteSpeed(save_data_path=self._save_data_path)
-        elif source == 'lynskey':
-            return Lynskey(save_data_path=self._save_data_path)
-        elif source == 'spokes':
-            return Spokes(save_data_path=self._save_data_path)
-        elif source == 'jenson':
-            return Jenson(save_data_path=self._save_data_path)
-        elif source == 'backcountry':
-            return BackCountry(save_data_path=self._save_data_path)
-        else:
-            raise ValueError(f'Invalid source: {source} value.')
-
-    def collect_all_products(self, get_specs=True, skip_failed=False):
+        scraper_class = get_scraper_class(source)
+        return scraper_class(save_data_path=self._save_data_path)
+
+    def collect_all_products(self, get_specs=True, skip_failed=False,
+                             incremental=False, resume=False, workers=1):
         """Collect raw data file from all sources."""
+        sources = list()
         for source in self._sources:
             # skip if source in exclude list
             if source in self._sources_exclude:
                 print(f'\nSKIPPING: {source} in exclude list!')
                 continue
+            sources.append(source)
 
-            # collect source otherwise
-            try:
-                self.collect_products_from_source(source, get_specs=get_specs)
-            except FileNotFoundError as e:
-                if not skip_failed:
-                    raise FileNotFoundError(e)
-                else:
-                    print(f'\nSKIPPING {source}: {e}')
+        self.collect_from_sources(sources, get_specs=get_specs,
+                                  skip_failed=skip_failed,
+                                  incremental=incremental, resume=resume,
+                                  workers=workers)
 
     def collect_from_sources(self, sources: list, get_specs=True,
-                             skip_failed=False):
-        """Collect raw data file from specified sources."""
-        for source in sources:
-            try:
-                self.collect_products_from_source(source, get_specs=get_specs)
-            except FileNotFoundError as e:
-                if not skip_failed:
-                    raise FileNotFoundError(e)
-                else:
-                    print(f'\nSKIPPING {source}: {e}')
-
-    def collect_products_from_source(self, source: str, get_specs=True):
-        """Collect raw data file for specified source."""
-        class_ = self._get_class_instance(source)
-        row_datas = class_.get_all_available_prods()
-        print(f'\n{source} row_data: {row_datas}')
-        self._mediator.update_manifest(rows=row_datas)
-        # TODO: inspect this section - should only be single row data parsed
-        if get_specs:
-            spec_rows = list()
-            for row_data in row_datas:
-                filepath = self._mediator.get_filepath_for_manifest_row(
-                    row=row_data)
-                spec_row = class_.get_product_specs(get_prods_from=filepath,
-                                                    bike_type=row_data[
-                                                        'bike_type'])
-                spec_rows.append(spec_row)
-            self._mediator.update_manifest(rows=spec_rows)
-
-    def collect_specs_matching(self, source: str, bike_type: str) -> dict:
-        """Collect specs data for given product source and bike_type."""
+                             skip_failed=False, incremental=False,
+                             resume=False, workers=1):
+        """Collect raw data file from specified sources.
+
+        Args:
+            workers: max sources collected concurrently, one thread per
+                source. Sources are collected one at a time if 1.
+        """
+        if workers <= 1 or len(sources) <= 1:
+            for source in sources:
+                self._collect_source(source, get_specs=get_specs,
+                                     skip_failed=skip_failed,
+                                     incremental=incremental, resume=resume)
+            return
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+            futures = [
+                executor.submit(self._collect_source, source,
+                                get_specs=get_specs, skip_failed=skip_failed,
+                                incremental=incremental, resume=resume)
+                for source in sources
+            ]
+            # raise first failure, in sources order, once all are done
+            wait(futures)
+            for future in futures:
+                future.result()
+
+    def _collect_source(self, source: str, get_specs=True, skip_failed=False,
+                        incremental=False, resume=False):
+        """Collect source, printing failures instead if skip_failed."""
+        try:
+            self.collect_products_from_source(source, get_specs=get_specs,
+                                              incremental=incremental,
+                                              resume=resume)
+        except FileNotFoundError as e:
+            if not skip_failed:
+                raise FileNotFoundError(e)
+            else:
+                print(f'\nSKIPPING {source}: {e}')
+
+    def _update_manifest(self, rows: list):
+        """Update manifest, one source at a time when run in parallel."""
+        with self._manifest_lock:
+            self._mediator.update_manifest(rows=rows)
+
+    def _get_table_pairs(self) -> dict:
+        with self._manifest_lock:
+            return self._mediator.get_table_pairs()
+
+    def collect_products_from_source(self, source: str, get_specs=True,
+                                     incremental=False, resume=False):
+        """Collect raw data file for specified source.
+
+        If incremental, only fetch specs for products that are new or changed
+        since the source's previous crawl files in the manifest. If resume,
+        skip products captured by an interrupted specs crawl.
+        """
+        # previous crawl files, before manifest points to the new ones
+        previous_pairs = dict()
+        if incremental:
+            previous_pairs = self._get_table_pairs().get(source, {})
+
+        with self._get_class_instance(source) as class_:
+            if not get_specs:
+                row_datas = class_.get_all_available_prods()
+                print(f'\n{source} row_data: {row_datas}')
+                self._update_manifest(rows=row_datas)
+                return
+
+            # specs fetched while listing pages are still being crawled
+            row_datas = class_.get_all_available_prods_and_specs(
+                previous=previous_pairs.get(class_.get_bike_type()),
+                resume=resume)
+            print(f'\n{source} row_data: {row_datas}')
+            self._update_manifest(rows=row_datas)
+
+    def collect_specs_matching(self, source: str, bike_type: str,
+                               incremental=False, resume=False) -> dict:
+        """Collect specs data for given product source and bike_type.
+
+        If incremental, only fetch specs for products missing from the
+        previous specs file in the manifest. If resume, skip products captured
+        by an interrupted specs crawl.
+        """
         row = self._mediator.get_rows_matching(sources=[source],
                                                bike_types=[bike_type],
                                                tablenames=['products'])[0]
 
         filepath = self._mediator.get_filepath_for_manifest_row(row)
 
-        class_ = self._get_class_instance(source)
-        spec_row_data = class_.get_product_specs(get_prods_from=filepath,
-                                                 bike_type=bike_type,
-                                                 to_csv=True)
+        previous = None
+        if incremental:
+            specs_rows = self._mediator.get_rows_matching(
+                sources=[source], bike_types=[bike_type],
+                tablenames=['product_specs'])
+            if specs_rows:
+                previous = {
+                    'product_specs':
+                        self._mediator.get_filepath_for_manifest_row(specs_rows[0])
+                }
+
+        with self._get_class_instance(source) as class_:
+            spec_row_data = class_.get_product_specs(get_prods_from=filepath,
+                                                     bike_type=bike_type,
+                                                     to_csv=True,
+                                                     previous=previous,
+                                                     resume=resume)
         print(
             f'[collect_specs_matching] {source} spec_row_data: {spec_row_data}')
-        self._mediator.update_manifest(rows=[spec_row_data])
+        self._update_manifest(rows=[spec_row_data])
         return spec_row_data
@@ -1,17 +1,33 @@
 """Module for loading raw data files into appropriate tables in the database"""
 
+import io
+import itertools
+import json
 import psycopg2
-from csv import DictReader
+from concurrent.futures import ThreadPoolExecutor
+from csv import DictReader, writer
+from psycopg2.pool import ThreadedConnectionPool
 
-from utils.utils import config
+from utils.utils import config, get_fieldnames_from_file
 
 
 class Ingest:
-    """Handles loading data csv files into the database tables."""
+    """Handles loading data csv files into the database tables.
 
-    def __init__(self, mediator):
+    Product specs are stored with one column per spec fieldname by default,
+    or with specs_storage='jsonb' as a single JSONB column of non-empty specs
+    per product, GIN indexed, so the table doesn't widen with new fieldnames.
+    """
+
+    def __init__(self, mediator, specs_storage='columns'):
+        if specs_storage not in ('columns', 'jsonb'):
+            raise ValueError(f'Invalid specs storage: {specs_storage} value.')
         self._mediator = mediator
+        self._specs_storage = specs_storage
         self._conn = None
+        self._pool = None
+        self._db_tables = None  # cached for the session
+        self._table_columns = dict()  # {tablename: set of columns} cache
         self._SPEC_FIELDNAMES = set()
         self._SPEC_FIELDNAMES_DEFAULT = {
             'levers', 'frame_seatpost', 'rotors', 'derailleur_pull', 'frame_material',
@@ -41,20 +57,40 @@ class Ingest:
         }
         self._PRODUCTS_TABLENAMES = ['products', 'imported_products']
         self._SPECS_TABLENAMES = ['product_specs', 'imported_specs']
+        self._JSONB_SPECS_FIELDNAMES = ['site', 'product_id', 'specs']
+        self._MUNGED_COLUMN_TYPES = {  # per Cleaner field names, else TEXT
+            'site': 'TEXT', 'bike_type': 'TEXT', 'product_id': 'TEXT',
+            'href': 'TEXT', 'description': 'TEXT', 'brand': 'TEXT',
+            'price': 'DOUBLE PRECISION', 'msrp': 'DOUBLE PRECISION',
+            'frame_material': 'TEXT', 'model_year': 'DOUBLE PRECISION',
+            'brake_type': 'TEXT', 'fork_material': 'TEXT',
+            'handlebar_material': 'TEXT', 'fd_groupset': 'TEXT',
+            'rd_groupset': 'TEXT', 'cassette_groupset': 'TEXT',
+            'crankset_material': 'TEXT', 'crankset_groupset': 'TEXT',
+            'seatpost_material': 'TEXT', 'chain_groupset': 'TEXT',
+            'shifter_groupset': 'TEXT'
+        }
         self._databases = {
           'local': 'db_local',
           'staging': 'db_staging',
           'prod': 'db_prod'
         }
 
-    def connect(self, database='local'):
-        """Connect to PostgreSQL database server. """
+    def connect(self, database='local', pool_size=1):
+        """Connect to PostgreSQL database server.
+
+        Opens a pool of up to pool_size connections, one of them held for
+        table management and single transaction loads.
+        """
 
         try:
             section = self._databases.get(database, 'db_local')
             params = config(section=section)
             print('Connecting to the PostgreSQL database...')
-            self._conn = psycopg2.connect(**params)
+            self._pool = ThreadedConnectionPool(1, max(pool_size, 1), **params)
+            self._conn = self._pool.getconn()
+            self._db_tables = None
+            self._table_columns = dict()
             return True
         except (Exception, psycopg2.DatabaseError) as e:
             print(e)
@@ -63,7 +99,11 @@ class Ingest:
 
     def close(self):
         """Close database server connection."""
-        if self._conn is not None:
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
+            print('Database connection is closed.')
+        elif self._conn is not None:
             self._conn.close()
             print('Database connection is closed.')
         else:
@@ -85,6 +125,17 @@ class Ingest:
 
         return statement[:-1] + ')'
 
+    def _generate_specs_jsonb_create_table_sql_statement(self, tablename):
+        """Generate the SQL statements for product_specs table storing specs
+        in a GIN indexed JSONB column."""
+        return """CREATE TABLE IF NOT EXISTS %s (
+      site VARCHAR(100) NOT NULL,
+      product_id VARCHAR(100) NOT NULL,
+      PRIMARY KEY (site, product_id),
+      specs JSONB NOT NULL DEFAULT '{}');
+    CREATE INDEX IF NOT EXISTS %s_specs_idx ON %s USING GIN (specs)""" % (
+            tablename, tablename, tablename)
+
     def get_db_tables(self) -> set:
         """Return tablenames in database."""
         result = set()
@@ -95,10 +146,32 @@ class Ingest:
         for table in cur.fetchall():
             result.add(table[0])
         cur.close()
+        self._db_tables = set(result)
         return result
 
+    def _get_cached_db_tables(self) -> set:
+        """Return tablenames in database, queried once per session and kept
+        up to date by create_table() and drop_table()."""
+        if self._db_tables is None:
+            self.get_db_tables()
+        return self._db_tables
+
+    def _get_table_columns(self, tablename: str) -> set:
+        """Return column names of table, queried once per session."""
+        if tablename not in self._table_columns:
+            with self._conn as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""SELECT column_name FROM information_schema.columns
+       WHERE table_schema = 'public' AND table_name = %s""", (tablename,))
+                    self._table_columns[tablename] = {
+                        column[0] for column in cur.fetchall()}
+        return self._table_columns[tablename]
+
     def create_table(self, tablename: str) -> bool:
         """Create tables in database."""
+        if tablename in self._get_cached_db_tables():
+            return True
+
         if tablename in self._PRODUCTS_TABLENAMES:
             command = """CREATE TABLE IF NOT EXISTS %s (
         bike_type VARCHAR(50),
@@ -111,7 +184,10 @@ class Ingest:
         price FLOAT,
         msrp FLOAT)""" % tablename
 
-        if tablename in self._SPECS_TABLENAMES:
+        if tablename in self._SPECS_TABLENAMES and self._specs_storage == 'jsonb':
+            command = self._generate_specs_jsonb_create_table_sql_statement(tablename)
+
+        elif tablename in self._SPECS_TABLENAMES:
             if self._SPEC_FIELDNAMES is None:
                 self._SPEC_FIELDNAMES = self._mediator.get_spec_fieldnames()
 
@@ -123,6 +199,8 @@ class Ingest:
             cur = self._conn.cursor()
             cur.execute(command)
             self._conn.commit()
+            self._db_tables.add(tablename)
+            self._table_columns.pop(tablename, None)
             success = True
         except (Exception, psycopg2.DatabaseError) as e:
             print(e)
@@ -141,6 +219,10 @@ class Ingest:
                 statement = """DROP TABLE IF EXISTS %s""" % table
                 cur.execute(statement)
             self._conn.commit()
+            for table in tablenames:
+                if self._db_tables is not None:
+                    self._db_tables.discard(table)
+                self._table_columns.pop(table, None)
             success = True
         except (Exception, psycopg2.DatabaseError) as e:
             print(e)
@@ -160,44 +242,208 @@ class Ingest:
 
     def process_file(self, tablename: str, filepath: str):
         """Load file into database."""
-        success = False
-        try:
-            # load csv into temp table - create if doesn't exist
-            with open(filepath, encoding='utf-8') as f:
-                cur = self._conn.cursor()
-                fieldnames = DictReader(f).fieldnames
-                if tablename in self._PRODUCTS_TABLENAMES:
-                    tmp_tablename = 'imported_products'
-                else:
-                    tmp_tablename = 'imported_specs'
-                    self._check_for_new_specs_columns(fieldnames)
-
-                self.create_table(tmp_tablename)
-                cur.copy_expert(sql=self._generate_copy_expert_statement(tmp_tablename,
-                                                                         fieldnames), file=f)
-                self._conn.commit()
-
-            # upsert into real table - create if doesn't exist
+        return self.load_files([(tablename, filepath)])[0]
+
+    def load_files(self, files: list) -> list:
+        """Bulk load csv files into their tables in a single transaction.
+
+        Files are copied into session temporary staging tables created once
+        for the load and dropped on commit, then each table gets a single
+        upsert from its staging table. A file that fails to copy is rolled
+        back on its own without failing the rest of the load.
+
+        Args:
+            files: list of (tablename, filepath) tuples.
+
+        Returns:
+            list of bools, True for each file loaded.
+        """
+        fieldnames = self._prepare_tables(files)
+        return self._load_files_in_transaction(self._conn, files, fieldnames)
+
+    def load_file_groups(self, groups: dict, workers=4) -> dict:
+        """Bulk load groups of csv files concurrently, each group in its own
+        transaction on a pooled connection, see load_files().
+
+        The pool raises instead of waiting when it has no free connection,
+        so workers is capped at pool_size - 1, one connection being held for
+        table management. With a pool_size of 1 groups are loaded one after
+        another on the held connection.
+
+        Args:
+            groups: {key: list of (tablename, filepath) tuples}, e.g. files
+                grouped per source and table.
+            workers: max number of groups loaded at once.
+
+        Returns:
+            {key: list of bools, True for each file loaded}.
+        """
+        files = [file for group in groups.values() for file in group]
+        fieldnames = dict(zip(files, self._prepare_tables(files)))
+
+        workers = min(workers, self._pool.maxconn - 1)
+        if workers < 1:
+            return {key: self._load_files_in_transaction(
+                        self._conn, group, [fieldnames[file] for file in group])
+                    for key, group in groups.items()}
+
+        def load_group(group):
+            conn = self._pool.getconn()
+            try:
+                return self._load_files_in_transaction(
+                    conn, group, [fieldnames[file] for file in group])
+            finally:
+                self._pool.putconn(conn)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(load_group, group)
+                       for key, group in groups.items()}
+            return {key: future.result() for key, future in futures.items()}
+
+    def _prepare_tables(self, files: list) -> list:
+        """Apply schema changes and create real tables needed by files ahead
+        of loading them, returning each file's fieldnames."""
+        fieldnames = [get_fieldnames_from_file(filepath) for _, filepath in files]
+        spec_fieldnames = dict.fromkeys(
+            fieldname for (tablename, _), file_fieldnames in zip(files, fieldnames)
+            if tablename in self._SPECS_TABLENAMES for fieldname in file_fieldnames)
+        if spec_fieldnames and self._specs_storage == 'columns':
+            # one schema change for all spec files
+            self._check_for_new_specs_columns(list(spec_fieldnames))
+        for tablename in dict.fromkeys(tablename for tablename, _ in files):
             self.create_table(tablename)
-            statement = """INSERT INTO %s
-        SELECT * FROM %s
-        ON CONFLICT DO NOTHING""" % (tablename, tmp_tablename)
-            cur.execute(statement)
-            self._conn.commit()
+        return fieldnames
+
+    def _load_files_in_transaction(self, conn, files: list, fieldnames: list) -> list:
+        """Load files through staging tables in one transaction on conn."""
+        loaded = [False] * len(files)
+        tablenames = list(dict.fromkeys(tablename for tablename, _ in files))
 
-            # don't keep temp table
-            self.drop_table([tmp_tablename])
+        cur = conn.cursor()
+        try:
+            for tablename in tablenames:
+                cur.execute("""CREATE TEMP TABLE staging_%s
+        (LIKE %s INCLUDING DEFAULTS) ON COMMIT DROP""" % (tablename, tablename))
+
+            for i, (tablename, filepath) in enumerate(files):
+                cur.execute('SAVEPOINT load_file')
+                try:
+                    with open(filepath, encoding='utf-8') as f:
+                        if (tablename in self._SPECS_TABLENAMES
+                                and self._specs_storage == 'jsonb'):
+                            cur.copy_expert(sql=self._generate_copy_expert_statement(
+                                f'staging_{tablename}', self._JSONB_SPECS_FIELDNAMES),
+                                file=self._get_jsonb_specs_buffer(f))
+                        else:
+                            cur.copy_expert(sql=self._generate_copy_expert_statement(
+                                f'staging_{tablename}', fieldnames[i]), file=f)
+                    cur.execute('RELEASE SAVEPOINT load_file')
+                    loaded[i] = True
+                except (Exception, psycopg2.DatabaseError) as e:
+                    print(f'{filepath}: {e}')
+                    cur.execute('ROLLBACK TO SAVEPOINT load_file')
+
+            for tablename in tablenames:
+                cur.execute("""INSERT INTO %s
+        SELECT * FROM staging_%s
+        ON CONFLICT DO NOTHING""" % (tablename, tablename))
+            conn.commit()
+        except (Exception, psycopg2.DatabaseError) as e:
+            print(e)
+            conn.rollback()
+            loaded = [False] * len(files)
+        finally:
+            cur.close()
+
+        return loaded
+
+    def _generate_df_create_table_sql_statement(self, tablename, fieldnames):
+        """Generate SQL statement for table of fieldnames typed per munged
+        column types, whatever dtypes the data frame was read with."""
+        columns = ['%s %s' % (name, self._MUNGED_COLUMN_TYPES.get(name, 'TEXT'))
+                   for name in fieldnames]
+        if 'site' in fieldnames and 'product_id' in fieldnames:
+            columns.append('PRIMARY KEY (site, product_id)')
+
+        return 'CREATE TABLE IF NOT EXISTS %s (\n%s)' % (tablename,
+                                                         ',\n'.join(columns))
+
+    @staticmethod
+    def _iter_record_batches(data, batch_size):
+        """Yield data frames of at most batch_size rows from data frame or
+        iterable of data frames."""
+        if hasattr(data, 'iloc'):
+            data = [data]
+        for df in data:
+            for start in range(0, len(df), batch_size):
+                yield df.iloc[start:start + batch_size]
+
+    def load_dataframe(self, tablename: str, data, batch_size=10000) -> bool:
+        """Load data frame, or iterable of data frames, into table straight
+        from memory, without writing csv files.
+
+        Record batches are written to an in memory buffer and streamed to a
+        staging table by COPY, then upserted in a single transaction. The
+        table is created if missing with the columns of the first batch,
+        typed per the munged data schema rather than inferred dtypes.
+        """
+        batches = self._iter_record_batches(data, batch_size)
+        first_batch = next(batches, None)
+        if first_batch is None:  # nothing to load
+            return True
+
+        if tablename not in self._get_cached_db_tables():
+            with self._conn as conn:
+                with conn.cursor() as cur:
+                    cur.execute(self._generate_df_create_table_sql_statement(
+                        tablename, list(first_batch.columns)))
+            self._db_tables.add(tablename)
 
+        success = False
+        cur = self._conn.cursor()
+        try:
+            cur.execute("""CREATE TEMP TABLE staging_%s
+        (LIKE %s INCLUDING DEFAULTS) ON COMMIT DROP""" % (tablename, tablename))
+
+            for batch in itertools.chain([first_batch], batches):
+                buffer = io.StringIO()
+                batch.to_csv(buffer, index=False)
+                buffer.seek(0)
+                cur.copy_expert(sql=self._generate_copy_expert_statement(
+                    f'staging_{tablename}', list(batch.columns)), file=buffer)
+
+            cur.execute("""INSERT INTO %s
+        SELECT * FROM staging_%s
+        ON CONFLICT DO NOTHING""" % (tablename, tablename))
+            self._conn.commit()
             success = True
         except (Exception, psycopg2.DatabaseError) as e:
             print(e)
             self._conn.rollback()
         finally:
             cur.close()
-            return success
+
+        return success
+
+    def _get_jsonb_specs_buffer(self, f) -> io.StringIO:
+        """Return in memory csv of (site, product_id, specs) rows for specs
+        csv file f, where specs is a json object of its non-empty values."""
+        buffer = io.StringIO()
+        csv_writer = writer(buffer)
+        csv_writer.writerow(self._JSONB_SPECS_FIELDNAMES)
+        for row in DictReader(f):
+            site = row.pop('site')
+            product_id = row.pop('product_id')
+            specs = {name: value for name, value in row.items() if value}
+            csv_writer.writerow([site, product_id, json.dumps(specs)])
+        buffer.seek(0)
+        return buffer
 
     def _check_for_new_specs_columns(self, fieldnames: list):
-        """Add new fieldname to master specs list and update real table columns."""
+        """Add new fieldname to master specs list and update real table columns.
+
+        Columns missing from the table are added by a single ALTER TABLE.
+        """
         exclude_fieldnames = ['site', 'product_id']  # exclude primary key fieldnames
         if self._SPEC_FIELDNAMES is None:
             self._SPEC_FIELDNAMES = self._mediator.get_spec_fieldnames()
@@ -209,14 +455,17 @@ class Ingest:
                 new_columns.add(fieldname)
 
         # add new columns to table iff it already exists
-        if new_columns and 'product_specs' in self.get_db_tables():
-            with self._conn as conn:
-                with conn.cursor() as cur:
-                    for fieldname in new_columns:
-                        cur.execute(
-                            """ALTER TABLE IF EXISTS product_specs
-                ADD COLUMN IF NOT EXISTS %s VARCHAR(500)
-              """ % fieldname)
+        if new_columns and 'product_specs' in self._get_cached_db_tables():
+            columns = self._get_table_columns('product_specs')
+            add_columns = sorted(new_columns - columns)
+            if add_columns:
+                statement = 'ALTER TABLE IF EXISTS product_specs\n' + ',\n'.join(
+                    'ADD COLUMN IF NOT EXISTS %s VARCHAR(500)' % fieldname
+                    for fieldname in add_columns)
+                with self._conn as conn:
+                    with conn.cursor() as cur:
+                        cur.execute(statement)
+                columns.update(add_columns)
 
         return new_columns
 
@@ -1,11 +1,7 @@
 import os
-import pandas as pd
 
-# Import package modules
-from ingestion.collect import Collect
-from ingestion.ingest import Ingest
-from ingestion.cleaner import Cleaner
-from ingestion.manifest import Manifest, MungedManifest
+# Import package modules, heavyweight ones are imported on first use
+from ingestion.manifest import MANIFEST_BACKENDS
 from utils.utils import TIMESTAMP, RAW_DATA_PATH, MUNGED_DATA_PATH
 from utils.utils import COMBINED_MUNGED_PATH
 
@@ -15,35 +11,77 @@ class IngestionMediator:
   Coordinates behavior for data collection and ingestion workflow across
   multiple classes involved. This is to allow decoupling between the
   classes involved and help clearly outline dependencies in workflow.
+
+  Collect, Ingest and Cleaner are only created, and their modules only
+  imported, when a workflow step first needs them.
   """
 
     def __init__(self, data_path=RAW_DATA_PATH, manifest_filename='manifest.csv',
                  munged_data_path=MUNGED_DATA_PATH,
                  combined_munged_path=COMBINED_MUNGED_PATH,
-                 munged_manifest_filename='munged_manifest.csv'):
+                 munged_manifest_filename='munged_manifest.csv',
+                 manifest_backend='csv', specs_storage='columns'):
+        self._data_path = data_path
         self._munged_data_path = munged_data_path
         self._combined_munged_path = combined_munged_path
-        self._ingest = Ingest(mediator=self)
-        self._collect = Collect(mediator=self, save_data_path=data_path)
-        self._cleaner = Cleaner(mediator=self, save_data_path=munged_data_path)
-        self._manifest = Manifest(mediator=self, path=data_path,
-                                  filename=manifest_filename)
-        self._munged_manifest = MungedManifest(mediator=self, path=munged_data_path,
-                                               filename=munged_manifest_filename)
-
-    def collect_sources(self, sources: list, get_specs=False, skip_failed=True):
+        self._specs_storage = specs_storage
+        self._ingest_instance = None
+        self._collect_instance = None
+        self._cleaner_instance = None
+        try:
+            manifest_class, munged_class = MANIFEST_BACKENDS[manifest_backend]
+        except KeyError:
+            raise ValueError(f'Invalid manifest backend: {manifest_backend} value.')
+        self._manifest = manifest_class(mediator=self, path=data_path,
+                                        filename=manifest_filename)
+        self._munged_manifest = munged_class(mediator=self, path=munged_data_path,
+                                             filename=munged_manifest_filename)
+
+    @property
+    def _ingest(self):
+        if self._ingest_instance is None:
+            from ingestion.ingest import Ingest  # psycopg2
+            self._ingest_instance = Ingest(mediator=self,
+                                           specs_storage=self._specs_storage)
+        return self._ingest_instance
+
+    @property
+    def _collect(self):
+        if self._collect_instance is None:
+            from ingestion.collect import Collect
+            self._collect_instance = Collect(mediator=self,
+                                             save_data_path=self._data_path)
+        return self._collect_instance
+
+    @property
+    def _cleaner(self):
+        if self._cleaner_instance is None:
+            from ingestion.cleaner import Cleaner  # pandas, numpy
+            self._cleaner_instance = Cleaner(
+                mediator=self, save_data_path=self._munged_data_path)
+        return self._cleaner_instance
+
+    def collect_sources(self, sources: list, get_specs=False, skip_failed=True,
+                        incremental=False, resume=False, workers=1):
         """Collect products from sources."""
         self._collect.collect_from_sources(sources=sources, get_specs=get_specs,
-                                           skip_failed=skip_failed)
+                                           skip_failed=skip_failed,
+                                           incremental=incremental,
+                                           resume=resume, workers=workers)
 
-    def collect_all(self, get_specs=False, skip_failed=True):
+    def collect_all(self, get_specs=False, skip_failed=True, incremental=False,
+                    resume=False, workers=1):
         """Collect products from all sources."""
-        self._collect.collect_all_products(get_specs, skip_failed)
+        self._collect.collect_all_products(get_specs, skip_failed, incremental,
+                                           resume, workers)
 
     # TODO: error handling if product file doesn't exist?!?!
-    def extract_specs(self, source: str, bike_type: str = 'all'):
+    def extract_specs(self, source: str, bike_type: str = 'all',
+                      incremental=False, resume=False):
         """Collect specs for sources."""
-        self._collect.collect_specs_matching(source=source, bike_type=bike_type)
+        self._collect.collect_specs_matching(source=source, bike_type=bike_type,
+                                             incremental=incremental,
+                                             resume=resume)
 
     def _load_manifest_row_to_db(self, row: dict) -> bool:
         """Attempt to load the given csv file into database."""
@@ -64,6 +102,10 @@ class IngestionMediator:
     def get_filepath_for_manifest_row(self, row: dict) -> str:
         return self._manifest.get_filepath_for_row(row)
 
+    def get_table_pairs(self) -> dict:
+        """Return {site: {bike_type: {tablename: filepath}}} from manifest."""
+        return self._manifest.get_table_pairs()
+
     def _recreate_database_tables(self):
         """Recreate all database tables."""
         tablenames = self._ingest.get_db_tables()
@@ -78,21 +120,44 @@ class IngestionMediator:
         for tablename in tablenames:
             self._ingest.create_table(tablename)
 
-    def _load_to_database(self, sources: list = [], drop_tables=False):
-        """Load data for specified sources into database."""
-        if self._ingest.connect():
-            if drop_tables:
-                self._recreate_database_tables()
-
+    def _load_to_database(self, sources: list = [], drop_tables=False,
+                          workers=1):
+        """Load data for specified sources into database, loading files of
+        each source and table concurrently when workers > 1."""
+        if self._ingest.connect(pool_size=workers + 1):
             loaded_rows = list()
-            manifest_rows = self._manifest.get_rows_matching(sources=sources)
-
-            for row in manifest_rows:
-                print(f'loading to database: {row["filename"]}')
-                if self._load_manifest_row_to_db(row):
-                    loaded_rows.append(row)
-
-            self._ingest.close()
+            try:
+                if drop_tables:
+                    self._recreate_database_tables()
+
+                manifest_rows = self._manifest.get_rows_matching(sources=sources)
+                files = [(row['tablename'],
+                          self._manifest.get_filepath_for_row(row))
+                         for row in manifest_rows]
+
+                print(f'loading to database: {len(files)} files')
+                if workers > 1:
+                    # load each source and table in its own transaction
+                    groups = dict()
+                    for row, file in zip(manifest_rows, files):
+                        groups.setdefault((row['site'], row['tablename']),
+                                          []).append((row, file))
+                    results = self._ingest.load_file_groups(
+                        {key: [file for _, file in group]
+                         for key, group in groups.items()}, workers=workers)
+                    results = [(row, loaded) for key, group in groups.items()
+                               for (row, _), loaded in zip(group, results[key])]
+                else:
+                    # load all files in one bulk transaction
+                    results = zip(manifest_rows, self._ingest.load_files(files))
+
+                for row, loaded in results:
+                    if loaded:
+                        row['loaded'] = True
+                        row['date_loaded'] = TIMESTAMP
+                        loaded_rows.append(row)
+            finally:
+                self._ingest.close()
 
             # update loaded manifest rows
             self._manifest.update(from_list=loaded_rows)
@@ -102,7 +167,7 @@ class IngestionMediator:
     # TODO: refactor to load process, excluding collect steps
     def update(self, sources: list, from_manifest=True,
                collect_only=False, drop_tables=True,
-               get_specs=True):
+               get_specs=True, workers=1):
         """Update only for the listed sources.
     
     Use downloaded data files currently in manifest.csv by default, else
@@ -115,7 +180,8 @@ class IngestionMediator:
 
         if not collect_only:
             print('loading to db...')
-            self._load_to_database(sources=sources, drop_tables=drop_tables)
+            self._load_to_database(sources=sources, drop_tables=drop_tables,
+                                   workers=workers)
 
     def update_specs_matching(self, source: str, bike_type: str) -> bool:
         if self._ingest.connect():
@@ -130,7 +196,8 @@ class IngestionMediator:
                                                 tablenames=tablenames, bike_types=bike_types, loaded=loaded)
 
     def close_conn(self):
-        self._ingest.close()
+        if self._ingest_instance is not None:
+            self._ingest.close()
 
     def get_spec_fieldnames(self):
         """Get spec fieldnames from all spec data files in manifest.csv."""
@@ -144,6 +211,8 @@ class IngestionMediator:
                 aggregate; else, aggregate using munged manifest.
             to_csv(bool): If True, save combined transformed data to csv.
         """
+        import pandas as pd
+
         # Initialize empty df for combining purpose
         agg_df = pd.DataFrame(columns=self._cleaner.get_field_names())
 
@@ -170,6 +239,20 @@ class IngestionMediator:
         self.update_munged_manifest(rows=[row_data])
         return row_data
 
+    def load_munged_data(self, source, bike_type='all') -> bool:
+        """Clean raw data files for given source and load the munged data
+        frame straight into the munged table, skipping the munged csv."""
+        munged_df = self._cleaner.clean_source(source, bike_type)
+        if self._ingest.connect():
+            try:
+                return self._ingest.load_dataframe(tablename='munged',
+                                                   data=munged_df)
+            finally:
+                self._ingest.close()
+
+        print(f'Database not updated - failed to connect!')
+        return False
+
     def transform_from_manifest(self, update_munged_manifest=True,
                                 save_cleaned_data=True,
                                 combine=False, save_combined=False):
@@ -181,28 +264,33 @@ class IngestionMediator:
             combine(bool): If True, aggregate munged data into single dataframe.
             save_combined(bool): If True, save the combined dataframe to csv.
         """
+        import pandas as pd
+
         # Initialize empty df for combining purpose
         agg_df = pd.DataFrame(columns=self._cleaner.get_field_names())
 
         # Get all unique source, bike_type pairings in manifest
         source_pairs = self._manifest.get_table_pairs()
-        for source, label_dict in source_pairs.items():
-            # Iterate through each pairing and clean raw data
-            for bike_type in label_dict:
-                try:
-                    munged_df = self._cleaner.clean_source(source, bike_type)
-                except ValueError:
-                    continue
-                # If combine, append to aggregate dataframe
-                if combine or save_combined:
-                    agg_df = agg_df.append(munged_df, ignore_index=True,
-                                           sort=False)
-                # Save transformed data if requested
-                if save_cleaned_data or update_munged_manifest:
-                    row = self._cleaner.save_munged_df(df=munged_df, source=source)
-                    # Update munged manifest if requested
-                    if update_munged_manifest:
-                        self._munged_manifest.update(from_list=[row])
+        # Write munged manifest once after all sources are cleaned
+        with self._munged_manifest.batch():
+            for source, label_dict in source_pairs.items():
+                # Iterate through each pairing and clean raw data
+                for bike_type in label_dict:
+                    try:
+                        munged_df = self._cleaner.clean_source(source, bike_type)
+                    except ValueError:
+                        continue
+                    # If combine, append to aggregate dataframe
+                    if combine or save_combined:
+                        agg_df = agg_df.append(munged_df, ignore_index=True,
+                                               sort=False)
+                    # Save transformed data if requested
+                    if save_cleaned_data or update_munged_manifest:
+                        row = self._cleaner.save_munged_df(df=munged_df,
+                                                           source=source)
+                        # Update munged manifest if requested
+                        if update_munged_manifest:
+                            self._munged_manifest.update(from_list=[row])
 
         # Save combined if requested
         if save_combined:
@@ -1,20 +1,45 @@
 import os
+import sqlite3
+import tempfile
+import threading
+from contextlib import contextmanager
 from csv import DictWriter, DictReader
 
+try:
+    import fcntl
+except ImportError:  # no advisory file locks, e.g. on Windows
+    fcntl = None
+
 from utils.utils import RAW_DATA_PATH, MUNGED_DATA_PATH
+from utils.utils import get_fieldnames_from_file, get_recorded_spec_fieldnames
+from utils.utils import record_spec_fieldnames
 
 
 class Manifest(object):
-    """Manifest is used to track state and path of raw data files."""
+    """Manifest is used to track state and path of raw data files.
+
+    Rows are read once into memory, indexed by (site, tablename, bike_type),
+    and only re-read when the file is changed on disk by someone else.
+
+    Writes hold an advisory lock on a .lock file next to the manifest, merge
+    updated rows into the file's latest rows and atomically replace the file,
+    so concurrent etl.py processes can share a manifest.
+    """
 
     def __init__(self, mediator, path=RAW_DATA_PATH, filename='raw_manifest.csv'):
         self._mediator = mediator
         self._DATA_PATH = path
         self._MANIFEST_PATH = os.path.join(path, filename)
+        self._LOCK_PATH = self._MANIFEST_PATH + '.lock'
         self._HEADERS = [
             'site', 'tablename', 'bike_type', 'filename', 'timestamp',
             'loaded', 'date_loaded'
         ]
+        self._rows = None  # {filename: row}
+        self._index = dict()  # {(site, tablename, bike_type): {filename: row}}
+        self._file_stat = None  # (mtime, size) of file when rows were read
+        self._batch_depth = 0
+        self._pending = dict()  # {filename: row} updated but not written
 
     def get_fieldnames(self):
         """Return column headers for manifest.csv."""
@@ -42,26 +67,28 @@ class Manifest(object):
 
         # Create new file if doesn't exist or requested
         if overwrite or not os.path.exists(self._MANIFEST_PATH):
-            with open(self._MANIFEST_PATH, mode='w') as f:
-                writer = DictWriter(f, fieldnames=self._HEADERS)
-                writer.writeheader()
+            with self._lock_file():
+                if overwrite or not os.path.exists(self._MANIFEST_PATH):
+                    self._rows = dict()
+                    self._index = dict()
+                    self._pending = dict()
+                    self._to_csv()
 
         # Raise error if file cannot be found
         if not os.path.exists(self._MANIFEST_PATH):
             raise FileNotFoundError(self._MANIFEST_PATH)
 
-        manifest = dict()
-        with open(self._MANIFEST_PATH) as f:
-            reader = DictReader(f)
-            for row in reader:
-                manifest[row['filename']] = row
+        self._get_rows()
 
         # Process add from_list option
         if from_list and self._validate_from_list(from_list):
             for data in from_list:
-                manifest[data['filename']] = data
+                row = {key: self._to_text(value) for key, value in data.items()}
+                self._add_row(row)
+                self._pending[row['filename']] = row
 
-            self._to_csv(manifest)
+            if not self._batch_depth:
+                self._flush()
             return True
 
         # Process add from_data option
@@ -70,6 +97,90 @@ class Manifest(object):
 
         return False
 
+    @contextmanager
+    def batch(self):
+        """Defer writing updates to the manifest file until the outermost
+        batch exits, so many updates cost a single write."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._pending:
+                self._flush()
+
+    @staticmethod
+    def _to_text(value) -> str:
+        """Return value as written to manifest csv."""
+        return '' if value is None else str(value)
+
+    @staticmethod
+    def _get_key(row: dict) -> tuple:
+        return row['site'], row['tablename'], row.get('bike_type', '')
+
+    def _get_file_stat(self):
+        stat = os.stat(self._MANIFEST_PATH)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _get_rows(self) -> dict:
+        """Return {filename: row} of manifest, reading the file only if
+        it has not been read yet or was changed since."""
+        if self._pending:  # unflushed updates are newer than the file
+            return self._rows
+
+        if self._rows is None or self._get_file_stat() != self._file_stat:
+            self._read_csv()
+
+        return self._rows
+
+    def _read_csv(self):
+        """Read manifest file into memory, replacing rows read before."""
+        file_stat = self._get_file_stat()
+        self._rows = dict()
+        self._index = dict()
+        with open(self._MANIFEST_PATH, encoding='utf-8') as f:
+            for row in DictReader(f):
+                self._add_row(row)
+        self._file_stat = file_stat
+
+    def _add_row(self, row: dict):
+        """Add or replace row by filename, keeping index in sync."""
+        key = self._get_key(row)
+        old_row = self._rows.get(row['filename'])
+        if old_row is not None and self._get_key(old_row) != key:
+            old_key = self._get_key(old_row)
+            del self._index[old_key][row['filename']]
+            if not self._index[old_key]:
+                del self._index[old_key]
+
+        self._rows[row['filename']] = row
+        self._index.setdefault(key, dict())[row['filename']] = row
+
+    @contextmanager
+    def _lock_file(self):
+        """Hold exclusive advisory lock on manifest across processes."""
+        with open(self._LOCK_PATH, mode='a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _flush(self):
+        """Write pending updates to manifest file, merged into the rows
+        written by other updaters since the file was read."""
+        with self._lock_file():
+            if (os.path.exists(self._MANIFEST_PATH)
+                    and self._get_file_stat() != self._file_stat):
+                self._read_csv()
+                for row in self._pending.values():
+                    self._add_row(row)
+
+            self._to_csv()
+            self._pending = dict()
+
     def _validate_from_list(self, data_list):
         """Validate that the passed data has appropriate fieldnames.
 
@@ -95,88 +206,87 @@ class Manifest(object):
 
         return True
 
-    def _to_csv(self, manifest):
-        """Write manifest to csv."""
-        with open(self._MANIFEST_PATH, 'w', encoding='utf-8') as f:
-            writer = DictWriter(f, fieldnames=self._HEADERS)
-            writer.writeheader()
+    def _to_csv(self):
+        """Write manifest to temp csv then rename it over the manifest, so
+        the manifest is never left partially written."""
+        fd, temp_path = tempfile.mkstemp(
+            dir=self._DATA_PATH, prefix=os.path.basename(self._MANIFEST_PATH),
+            suffix='.tmp')
+        os.chmod(temp_path, 0o644)  # mkstemp creates owner only files
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                writer = DictWriter(f, fieldnames=self._HEADERS)
+                writer.writeheader()
+
+                for data in self._rows.values():
+                    writer.writerow(data)
+
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self._MANIFEST_PATH)
+        except BaseException:
+            os.remove(temp_path)
+            raise
 
-            for data in manifest.values():
-                writer.writerow(data)
+        self._file_stat = self._get_file_stat()
 
     def get_all_rows(self) -> list:
         """Return list of dict objects representing all rows in manifest.csv."""
-        rows = list()
-        with open(self._MANIFEST_PATH, encoding='utf-8') as f:
-            reader = DictReader(f)
-
-            for row in reader:
-                rows.append(row)
-
-        return rows
+        return [dict(row) for row in self._get_rows().values()]
 
     def get_unique_spec_fieldnames(self):
-        """Return set of fieldnames used in all spec files in manifest.csv."""
+        """Return set of fieldnames used in all spec files in manifest.csv.
+
+        Headers are taken from the spec fieldnames index written alongside
+        each spec file; files missing from the index are read once and added.
+        """
         exclude_fieldnames = ['site', 'product_id']  # exclude primary key fieldnames
-        rows = self.get_all_rows()
+        recorded = get_recorded_spec_fieldnames(self._DATA_PATH)
         spec_fieldnames = set()
 
-        for row in rows:
-            if row['tablename'] == 'product_specs':
-                filepath = os.path.join(self._DATA_PATH, row['timestamp'], row['filename'])
-                with open(filepath, encoding='utf-8') as f:
-                    fieldnames = DictReader(f).fieldnames
+        for row in self.get_specs_rows():
+            fieldnames = recorded.get(os.path.join(row['timestamp'], row['filename']))
+            if fieldnames is None:
+                filepath = self.get_filepath_for_row(row)
+                fieldnames = get_fieldnames_from_file(filepath)
+                record_spec_fieldnames(self._DATA_PATH, filepath, fieldnames)
 
-                    for fieldname in fieldnames:
-                        if fieldname in exclude_fieldnames:
-                            continue
-                        spec_fieldnames.add(fieldname)
+            for fieldname in fieldnames:
+                if fieldname in exclude_fieldnames:
+                    continue
+                spec_fieldnames.add(fieldname)
 
         return spec_fieldnames
 
     def get_product_rows(self):
         """Get rows for products raw files in manifest.csv."""
-        prod_rows = list()
-        rows = self.get_all_rows()
-
-        for row in rows:
-            if row['tablename'] == 'products':
-                prod_rows.append(row)
-
-        return prod_rows
+        return self.get_rows_matching(tablenames=['products'])
 
     def get_specs_rows(self):
         """Get rows for product specs raw files in manifest.csv."""
-        specs_rows = list()
-        rows = self.get_all_rows()
-
-        for row in rows:
-            if row['tablename'] == 'product_specs':
-                specs_rows.append(row)
-
-        return specs_rows
+        return self.get_rows_matching(tablenames=['product_specs'])
 
     def get_rows_matching(self, sources: list = [], tablenames: list = [],
                           bike_types: list = [], loaded: list = []) -> list:
         """Return list of manifest rows matching provided arguments."""
         matching_rows = list()
-        with open(self._MANIFEST_PATH, encoding='utf-8') as f:
-            reader = DictReader(f)
+        self._get_rows()
 
-            for row in reader:
-                if sources and row['site'] not in sources:
-                    continue
+        for (site, tablename, bike_type), rows in self._index.items():
+            if sources and site not in sources:
+                continue
 
-                if tablenames and row['tablename'] not in tablenames:
-                    continue
+            if tablenames and tablename not in tablenames:
+                continue
 
-                if bike_types and row['bike_type'] not in bike_types:
-                    continue
+            if bike_types and bike_type not in bike_types:
+                continue
 
+            for row in rows.values():
                 if loaded and row['loaded'] not in loaded:
                     continue
 
-                matching_rows.append(row)
+                matching_rows.append(dict(row))
 
         return matching_rows
 
@@ -191,15 +301,16 @@ class Manifest(object):
             tablename is "products" or "product_specs"
         """
         pairs = dict()
+        self._get_rows()
 
-        for row in self.get_all_rows():
+        for (site, tablename, bike_type), rows in self._index.items():
             # Get or set default for site
-            site_dict = pairs.setdefault(row['site'], {})
+            site_dict = pairs.setdefault(site, {})
             # Get or set default for bike_type
-            bike_type_dict = site_dict.setdefault(row['bike_type'], {})
-            # Set value for tablename
-            file_path = self.get_filepath_for_row(row)
-            bike_type_dict[row['tablename']] = file_path
+            bike_type_dict = site_dict.setdefault(bike_type, {})
+            # Set value for tablename from latest row
+            row = next(reversed(rows.values()))
+            bike_type_dict[tablename] = self.get_filepath_for_row(row)
         return pairs
 
 
@@ -212,3 +323,148 @@ class MungedManifest(Manifest):
             'site', 'tablename', 'filename', 'timestamp',
             'loaded', 'date_loaded'
         ]
+
+
+class SqliteManifest(Manifest):
+    """Manifest stored in a local SQLite database instead of a csv file.
+
+    Rows are upserted by filename in transactions and looked up through
+    indexes on site, tablename, bike_type and loaded, so parallel collectors
+    and loaders can record state concurrently. The database file is named
+    after the csv filename with a .db extension.
+    """
+
+    def __init__(self, mediator, path=RAW_DATA_PATH, filename='raw_manifest.csv'):
+        super(SqliteManifest, self).__init__(mediator, path, filename)
+        self._MANIFEST_PATH = os.path.join(
+            path, os.path.splitext(filename)[0] + '.db')
+        self._TABLENAME = 'manifest'
+        self._INDEXED = ['site', 'tablename', 'bike_type', 'loaded']
+        self._table_created = False
+        self._local = threading.local()  # batch connection per thread
+
+    def _create_table(self, conn):
+        """Create manifest table and its indexes if missing."""
+        columns = ', '.join(
+            f'{header} TEXT PRIMARY KEY' if header == 'filename'
+            else f'{header} TEXT' for header in self._HEADERS)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(
+            f'CREATE TABLE IF NOT EXISTS {self._TABLENAME} ({columns})')
+        for header in self._INDEXED:
+            if header in self._HEADERS:
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS {self._TABLENAME}_{header}_idx '
+                    f'ON {self._TABLENAME} ({header})')
+        self._table_created = True
+
+    @contextmanager
+    def _connect(self):
+        """Yield connection in a transaction, committed on exit, or the
+        connection of the current thread's open batch."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = sqlite3.connect(self._MANIFEST_PATH, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            if not self._table_created:
+                self._create_table(conn)
+            with conn:  # commit, or rollback on error
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def batch(self):
+        """Record all updates in the batch in a single transaction."""
+        if getattr(self._local, 'conn', None) is not None:  # nested
+            yield self
+            return
+
+        with self._connect() as conn:
+            self._local.conn = conn
+            try:
+                yield self
+            finally:
+                self._local.conn = None
+
+    def update(self, from_data=False, from_list=[], overwrite=False) -> bool:
+        """Upsert manifest rows, see Manifest.update()."""
+        # Raise error if attempt to load from both data and list
+        if from_data and from_list:
+            raise SyntaxError('Cannot load from both raw data and list of data.')
+
+        with self._connect() as conn:
+            if overwrite:
+                conn.execute(f'DELETE FROM {self._TABLENAME}')
+
+            # Process add from_list option
+            if from_list and self._validate_from_list(from_list):
+                columns = ', '.join(self._HEADERS)
+                values = ', '.join(['?'] * len(self._HEADERS))
+                updates = ', '.join(f'{header} = excluded.{header}'
+                                    for header in self._HEADERS
+                                    if header != 'filename')
+                conn.executemany(
+                    f'INSERT INTO {self._TABLENAME} ({columns}) '
+                    f'VALUES ({values}) '
+                    f'ON CONFLICT (filename) DO UPDATE SET {updates}',
+                    [[self._to_text(data[header]) for header in self._HEADERS]
+                     for data in from_list])
+                return True
+
+        return False
+
+    def get_all_rows(self) -> list:
+        """Return list of dict objects representing all rows in manifest."""
+        return self.get_rows_matching()
+
+    def get_rows_matching(self, sources: list = [], tablenames: list = [],
+                          bike_types: list = [], loaded: list = []) -> list:
+        """Return list of manifest rows matching provided arguments."""
+        conditions = list()
+        params = list()
+        for header, values in [('site', sources), ('tablename', tablenames),
+                               ('bike_type', bike_types), ('loaded', loaded)]:
+            if values:
+                conditions.append(
+                    f'{header} IN ({", ".join(["?"] * len(values))})')
+                params.extend(values)
+
+        query = f'SELECT * FROM {self._TABLENAME}'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+
+        with self._connect() as conn:
+            rows = conn.execute(query + ' ORDER BY rowid', params).fetchall()
+
+        return [dict(row) for row in rows]
+
+    def get_table_pairs(self) -> dict:
+        """For each site, bike_type get filepath for prods and specs data.
+
+        Return dict: {site: {bike_type: {tablename: filepath}} where
+            tablename is "products" or "product_specs"
+        """
+        pairs = dict()
+
+        for row in self.get_all_rows():
+            site_dict = pairs.setdefault(row['site'], {})
+            bike_type_dict = site_dict.setdefault(row['bike_type'], {})
+            bike_type_dict[row['tablename']] = self.get_filepath_for_row(row)
+        return pairs
+
+
+class SqliteMungedManifest(SqliteManifest, MungedManifest):
+    def __init__(self, mediator, path=MUNGED_DATA_PATH,
+                 filename='munged_manifest.csv'):
+        super(SqliteMungedManifest, self).__init__(mediator, path, filename)
+
+
+MANIFEST_BACKENDS = {  # backend: (manifest class, munged manifest class)
+    'csv': (Manifest, MungedManifest),
+    'sqlite': (SqliteManifest, SqliteMungedManifest)
+}
@@ -7,6 +7,12 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class BackCountry(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'class': 'plp-product-grid'}),
+                    ('li', {'class': 'pag-next'})],
+        'spec': [('div', {'id': 'accordion-parent'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.backcountry.com',
                          source='backcountry',
@@ -87,8 +93,8 @@ class BackCountry(Scraper):
         bike_categories = self._get_subtypes()
         for bike_type, subtypes in bike_categories.items():
             for subtype, href in subtypes.items():
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
-                    endpoint=href), 'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(
+                    endpoint=href), 'listing')
                 print(f'Parsing first page for {bike_type}: {subtype}...')
                 self._get_prods_on_current_listings_page(soup, bike_type,
                                                          subtype)
@@ -98,8 +104,8 @@ class BackCountry(Scraper):
                 while next_page:
                     counter += 1
                     print('\tparsing page:', counter)
-                    soup = BeautifulSoup(self._fetch_prod_listing_view(
-                        endpoint), 'lxml')
+                    soup = self._get_soup(self._fetch_prod_listing_view(
+                        endpoint), 'listing')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
                     next_page, endpoint = self._get_next_page(soup)
@@ -147,7 +153,7 @@ class BackCountry(Scraper):
                 msrp = div_price.find('span', class_='ui-pl-pricing-high-price').string
                 product['msrp'] = float(msrp.strip().strip('$').replace(',', ''))
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup) -> dict:
@@ -7,6 +7,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class BicycleWarehouse(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [(None, {'class': 'productgrid--item'}),
+                    ('li', {'class': 'pagination--next'})],
+        'spec': [('div', {'id': 'tabs'}),
+                 ('div', {'class': 'easytabs-text'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://bicyclewarehouse.com',
                          source='bicycle_warehouse',
@@ -103,8 +110,8 @@ class BicycleWarehouse(Scraper):
         for bike_type, subtypes in bike_categories.items():
             for subtype, href in subtypes.items():
                 print(f'Parsing first page for {bike_type}: {subtype}...')
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
-                    endpoint=href), 'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(
+                    endpoint=href), 'listing')
                 self._get_prods_on_current_listings_page(soup, bike_type,
                                                          subtype)
                 next_page, endpoint = self._get_next_page(soup)
@@ -113,8 +120,8 @@ class BicycleWarehouse(Scraper):
                 while next_page:
                     counter += 1
                     print('\tparsing page:', counter)
-                    soup = BeautifulSoup(self._fetch_prod_listing_view(
-                        endpoint), 'lxml')
+                    soup = self._get_soup(self._fetch_prod_listing_view(
+                        endpoint), 'listing')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
                     next_page, endpoint = self._get_next_page(soup)
@@ -162,7 +169,7 @@ class BicycleWarehouse(Scraper):
             except AttributeError:  # handle not on sale
                 product['msrp'] = product['price']
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup) -> dict:
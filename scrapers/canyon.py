@@ -7,6 +7,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Canyon(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [(None, {'id': 'section-product-grid'})],
+        'spec': [('div', {'class': 'productDetailHeader'}),
+                 ('div', {'class': 'productDetail__bottom'}),
+                 (None, {'id': 'all-components-section-panel'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.canyon.com',
                          source='canyon', save_data_path=save_data_path)
@@ -105,7 +112,7 @@ class Canyon(Scraper):
             except AttributeError:  # handle not on sale
                 product['msrp'] = product['price']
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _get_max_num_prods(self, soup):
@@ -123,8 +130,8 @@ class Canyon(Scraper):
             for subtype, models in subtypes.items():
                 for model, href in models.items():
                     print(f'Parsing prods for {bike_type}:{subtype}:{model}...')
-                    soup = BeautifulSoup(self._fetch_prod_listing_view(
-                        endpoint=href), 'lxml')
+                    soup = self._get_soup(self._fetch_prod_listing_view(
+                        endpoint=href), 'listing')
                     try:
                         self._get_prods_on_current_listings_page(
                             soup, bike_type, subtype
@@ -9,6 +9,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class CityBikes(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'id': 'SearchProducts'}),
+                    ('div', {'class': 'sePaginationWrapper'})],
+        'spec': [(None, {'id': 'ProductDetailsContent'}),
+                 ('div', {'id': 'ProductSpecs'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH, page_size=60):
         super().__init__(base_url='https://www.citybikes.com',
                          source='citybikes', save_data_path=save_data_path)
@@ -101,8 +108,8 @@ class CityBikes(Scraper):
         for bike_type, subtypes in categories.items():
             for subtype in subtypes:
                 qs = 'rb_ct=' + str(subtypes[subtype]['filter_val'])
-                soup = BeautifulSoup(self._fetch_prod_listing_view(qs=qs),
-                                     'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(qs=qs),
+                                      'listing')
                 print(f'Parsing first page for {bike_type}: {subtype}...')
                 self._get_prods_on_current_listings_page(soup, bike_type,
                                                          subtype)
@@ -113,7 +120,7 @@ class CityBikes(Scraper):
                     counter += 1
                     print('\tparsing page:', counter)
                     url = f'{self._BASE_URL}{endpoint}'
-                    soup = BeautifulSoup(self._fetch_html(url), 'lxml')
+                    soup = self._get_soup(self._fetch_html(url), 'listing')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
                     next_page, endpoint = self._get_next_page(soup)
@@ -181,7 +188,7 @@ class CityBikes(Scraper):
             product['price'] = float(price.strip('$').replace(',', ''))
             product['msrp'] = float(msrp.strip('$').replace(',', ''))
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
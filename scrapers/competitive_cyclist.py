@@ -4,6 +4,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class CompetitiveCyclist(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'class': 'results'}),
+                    ('li', {'class': 'pag-next'})],
+        'spec': [(None, {'id': 'product-description'}),
+                 ('div', {'class': 'tech-specs__section'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH, page_size=42):
         self._page_size = page_size
         super().__init__(base_url='https://www.competitivecyclist.com',
@@ -127,7 +134,7 @@ class CompetitiveCyclist(Scraper):
                 product['price'] = -1
                 product['msrp'] = -1
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
@@ -172,8 +179,8 @@ class CompetitiveCyclist(Scraper):
         for bike_type, subtypes in categories.items():
             for subtype, href in subtypes.items():
                 print(f'Parsing first page for {bike_type}:{subtype}...')
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
-                    endpoint=href), 'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(
+                    endpoint=href), 'listing')
                 self._get_prods_on_current_listings_page(
                     soup, bike_type, subtype
                 )
@@ -183,8 +190,8 @@ class CompetitiveCyclist(Scraper):
                 while next_page:
                     counter += 1
                     print('\tparsing page:', counter)
-                    soup = BeautifulSoup(self._fetch_prod_listing_view(
-                        endpoint), 'lxml')
+                    soup = self._get_soup(self._fetch_prod_listing_view(
+                        endpoint), 'listing')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
                     next_page, endpoint = self._get_next_page(soup)
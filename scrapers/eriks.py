@@ -9,6 +9,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class EriksBikes(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'class': 'SearchProductList'}),
+                    ('div', {'class': 'searchHeadingInfo'})],
+        'spec': [('div', {'class': 'product-description'}),
+                 ('div', {'class': 'specs'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.eriksbikeshop.com',
                          source='eriks', save_data_path=save_data_path)
@@ -103,7 +110,7 @@ class EriksBikes(Scraper):
             for subtype, href in subtypes.items():
                 print(f'Getting {bike_type}:{subtype}...')
                 # Scrape first page, get num bikes, and determine num pages
-                soup = BeautifulSoup(self._fetch_html(url=href), 'lxml')
+                soup = self._get_soup(self._fetch_html(url=href), 'listing')
                 num_bikes = self._get_prods_on_current_listings_page(
                     soup, bike_type, subtype, get_num_bikes=True
                 )
@@ -112,8 +119,8 @@ class EriksBikes(Scraper):
                 # Scrape remaining pages for bike category
                 for page in range(2, pages):
                     qs = {'\tparsing page': page}
-                    soup = BeautifulSoup(self._fetch_html(
-                        url=href, params=qs), 'lxml')
+                    soup = self._get_soup(self._fetch_html(
+                        url=href, params=qs), 'listing')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
 
@@ -171,7 +178,7 @@ class EriksBikes(Scraper):
             except AttributeError:
                 product['msrp'] = product['price']
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
         # If requested return number of bike products
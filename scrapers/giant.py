@@ -10,6 +10,12 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Giant(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'id': 'productsContainer'})],
+        'spec': [(None, {'id': 'intro'}),
+                 ('div', {'id': 'specifications'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.giant-bicycles.com',
                          source='giant', save_data_path=save_data_path)
@@ -68,8 +74,8 @@ class Giant(Scraper):
         for bike_type, subtypes in bike_categories.items():
             for subtype, href in subtypes.items():
                 print(f'Getting {bike_type}:{subtype}...')
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
-                    endpoint=href), 'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(
+                    endpoint=href), 'listing')
                 self._get_prods_on_current_listings_page(soup, bike_type,
                                                          subtype)
 
@@ -90,7 +96,7 @@ class Giant(Scraper):
             print('\t[get_prods] Getting models for', href)
 
             # Get product info for each model available
-            soup_model = BeautifulSoup(self._fetch_prod_listing_view(href), 'lxml')
+            soup_model = self._get_soup(self._fetch_prod_listing_view(href), 'listing')
             container = soup_model.find('div', id='productsContainer')
             bike_summary = container.find_all('div', class_='bike-summary')
 
@@ -113,7 +119,7 @@ class Giant(Scraper):
                 price = float(price.strip().strip('$').replace(',', ''))
                 product['price'] = price
                 product['msrp'] = price
-                self._products[prod_id] = product
+                self._add_product(prod_id, product)
                 print(f'\t\t[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
@@ -7,6 +7,12 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Jenson(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('section', {'id': 'productList'}),
+                    ('span', {'class': 'page-label'})],
+        'spec': [('div', {'id': 'prod-tab-frame-D'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH, page_size=100):
         super().__init__(base_url='https://www.jensonusa.com',
                          source='jenson', save_data_path=save_data_path)
@@ -93,9 +99,9 @@ class Jenson(Scraper):
         # Scrape pages for each available category
         for bike_type, subtypes in categories.items():
             for subtype, href in subtypes.items():
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
+                soup = self._get_soup(self._fetch_prod_listing_view(
                     endpoint=href, include_base=False
-                ), 'lxml')
+                ), 'listing')
                 print(f'Parsing {bike_type}:{subtype}...')
                 self._get_prods_on_current_listings_page(soup, bike_type,
                                                          subtype)
@@ -108,10 +114,10 @@ class Jenson(Scraper):
 
                 # Scrape all pages for bike category
                 for page in range(1, pages):
-                    soup = BeautifulSoup(self._fetch_prod_listing_view(
+                    soup = self._get_soup(self._fetch_prod_listing_view(
                         endpoint=href, page=page, page_size=self._page_size,
                         include_base=False
-                    ), 'lxml')
+                    ), 'listing')
                     print(f'\t\tParsing next page...')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
@@ -160,7 +166,7 @@ class Jenson(Scraper):
             except AttributeError:
                 product['msrp'] = product['price']
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
@@ -8,6 +8,14 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class LiteSpeed(Scraper):
+    _PARSE_IN_PROCESS = False  # specs parsing fetches upgrade options
+    _PAGE_REGIONS = {
+        'listing': [('a', {'class': 'product-info__caption'})],
+        'spec': [('div', {'class': 'description', 'itemprop': 'description'}),
+                 ('div', {'class': 'product_form'}),
+                 ('li', {'id': 'tab2'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://litespeed.com',
                          source='litespeed',
@@ -85,8 +93,8 @@ class LiteSpeed(Scraper):
         categories = self._get_subtypes()
         for bike_type, subtypes in categories.items():
             for subtype, href in subtypes.items():
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
-                    href), 'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(
+                    href), 'listing')
                 print(f'Parsing {bike_type}...')
                 self._get_prods_on_current_listings_page(soup, bike_type,
                                                          subtype)
@@ -130,7 +138,7 @@ class LiteSpeed(Scraper):
             except AttributeError:  # handle not on sale
                 product['msrp'] = product['price']
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup) -> list:
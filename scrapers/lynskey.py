@@ -7,6 +7,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Lynskey(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('article', {'class': 'product-grid-item'}),
+                    ('a', {'class': 'next'})],
+        'spec': [('div', {'class': 'single-product-right'}),
+                 ('div', {'class': 'single-product-left'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://lynskeyperformance.com',
                          source='lynskey',
@@ -97,8 +104,8 @@ class Lynskey(Scraper):
         for bike_type, subtypes in categories.items():
             for subtype, models in subtypes.items():
                 for model, href in models.items():
-                    soup = BeautifulSoup(self._fetch_prod_listing_view(
-                        endpoint=href, base_url=False), 'lxml')
+                    soup = self._get_soup(self._fetch_prod_listing_view(
+                        endpoint=href, base_url=False), 'listing')
                     print(f'Parsing {bike_type}:{subtype}...')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
@@ -106,7 +113,7 @@ class Lynskey(Scraper):
 
                     # Iterate through all next pages
                     while next_page:
-                        soup = BeautifulSoup(self._fetch_html(url), 'lxml')
+                        soup = self._get_soup(self._fetch_html(url), 'listing')
                         print(f'\t\tParsing next page...')
                         self._get_prods_on_current_listings_page(soup, bike_type,
                                                                  subtype)
@@ -153,7 +160,7 @@ class Lynskey(Scraper):
             except AttributeError:  # handle not on sale
                 product['msrp'] = product['price']
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup) -> list:
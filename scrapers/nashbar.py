@@ -6,6 +6,12 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class NashBar(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'id': 'productsview'}),
+                    ('div', {'id': 'pagetotalsview'})],
+        'spec': [(None, {'id': 'tab-overview'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.nashbar.com',
                          source='nashbar', save_data_path=save_data_path)
@@ -101,7 +107,7 @@ class NashBar(Scraper):
             else:
                 product['msrp'] = float(str(span_old_price.string).strip().split()[-1].strip('$').replace(',', ''))
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
@@ -157,7 +163,7 @@ class NashBar(Scraper):
             for subtype, href in subtypes.items():
                 # Calculate total number of pages
                 html = self._fetch_prod_listing_view(endpoint=href)
-                soup = BeautifulSoup(html, 'lxml')
+                soup = self._get_soup(html, 'listing')
 
                 page_totals_view = soup.find('div', attrs={'id': 'pagetotalsview'})
                 result = page_totals_view.string.split()
@@ -171,7 +177,7 @@ class NashBar(Scraper):
                     html = self._fetch_prod_listing_view(
                         endpoint=href, params={'p': p}
                     )
-                    soup = BeautifulSoup(html, 'lxml')
+                    soup = self._get_soup(html, 'listing')
                     self._get_prods_on_current_listings_page(soup, bike_type,
                                                              subtype)
 
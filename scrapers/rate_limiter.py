@@ -0,0 +1,72 @@
+"""
+Module for throttling scraper requests with per host token buckets.
+"""
+import threading
+import time
+
+_HOST_LIMITERS = dict()  # host: TokenBucket shared by all scrapers
+_HOST_LIMITERS_LOCK = threading.Lock()
+
+
+class TokenBucket:
+    """Thread safe token bucket allowing burst requests at once and then
+    rate requests per second sustained.
+
+    A rate of 0 or less disables throttling.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self._rate = rate
+        self._burst = max(burst, 1)
+        self._tokens = float(self._burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get_rate(self) -> float:
+        return self._rate
+
+    def get_burst(self) -> int:
+        return self._burst
+
+    def _reserve(self) -> float:
+        """Take a token and return seconds to wait before it's available."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(self._burst,
+                               self._tokens + elapsed * self._rate)
+            self._last_refill = now
+
+            # tokens below zero are reservations for waiting callers
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+    def acquire(self) -> float:
+        """Block until a token is available.
+
+        Returns:
+            seconds spent waiting for the token.
+        """
+        if self._rate <= 0:
+            return 0.0
+
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def get_host_limiter(host: str, rate: float, burst: int = 1) -> TokenBucket:
+    """Return the shared token bucket for host, creating it if missing.
+
+    The first rate and burst registered for a host are kept so that every
+    scraper requesting from that host draws from the same bucket.
+    """
+    with _HOST_LIMITERS_LOCK:
+        limiter = _HOST_LIMITERS.get(host)
+        if limiter is None:
+            limiter = TokenBucket(rate=rate, burst=burst)
+            _HOST_LIMITERS[host] = limiter
+    return limiter
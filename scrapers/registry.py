@@ -0,0 +1,36 @@
+"""
+Module mapping source names to their scraper classes, imported on first use.
+"""
+from importlib import import_module
+
+SCRAPERS = {  # source: (module, class name)
+    'backcountry': ('scrapers.backcountry', 'BackCountry'),
+    'bicycle_warehouse': ('scrapers.bicycle_warehouse', 'BicycleWarehouse'),
+    'bike_doctor': ('scrapers.bike_doctor', 'BikeDoctor'),
+    'canyon': ('scrapers.canyon', 'Canyon'),
+    'citybikes': ('scrapers.citybikes', 'CityBikes'),
+    'competitive': ('scrapers.competitive_cyclist', 'CompetitiveCyclist'),
+    'contebikes': ('scrapers.contebikes', 'ConteBikes'),
+    'eriks': ('scrapers.eriks', 'EriksBikes'),
+    'giant': ('scrapers.giant', 'Giant'),
+    'jenson': ('scrapers.jenson', 'Jenson'),
+    'litespeed': ('scrapers.litespeed', 'LiteSpeed'),
+    'lynskey': ('scrapers.lynskey', 'Lynskey'),
+    'nashbar': ('scrapers.nashbar', 'NashBar'),
+    'proshop': ('scrapers.proshop', 'Proshop'),
+    'rei': ('scrapers.rei', 'Rei'),
+    'specialized': ('scrapers.specialized', 'Specialized'),
+    'spokes': ('scrapers.spokes', 'Spokes'),
+    'trek': ('scrapers.trek', 'Trek'),
+    'wiggle': ('scrapers.wiggle', 'Wiggle')
+}
+
+
+def get_scraper_class(source: str):
+    """Return scraper class for source, importing only its module."""
+    try:
+        module_name, class_name = SCRAPERS[source]
+    except KeyError:
+        raise ValueError(f'Invalid source: {source} value.')
+
+    return getattr(import_module(module_name), class_name)
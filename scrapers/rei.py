@@ -11,6 +11,11 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Rei(Scraper):
+    _PAGE_REGIONS = {
+        'spec': [[('script', {'data-client-store': 'product-details'}),
+                  ('script', {'id': 'page-data'})]]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH, page_size=90):
         self._page_size = page_size
         super().__init__(base_url='http://www.rei.com',
@@ -139,24 +144,43 @@ class Rei(Scraper):
             product['price'] = display_price['max']
             product['msrp'] = display_price['compareAt']
 
-            self._products[prod['prodId']] = product
+            self._add_product(prod['prodId'], product)
             print(f'[{len(self._products)}] New bike: ', product)
 
+    @staticmethod
+    def _get_specs_script_attrs(garage=False) -> dict:
+        """Return attrs of script with json data per rei or rei-garage/outlet."""
+        if garage:
+            return {'id': 'page-data'}
+        return {'data-client-store': 'product-details'}
+
+    def _parse_spec_page(self, bike, html):
+        """Parse specifications from page's embedded json data, only building
+        soup if the script block can't be extracted from the raw text."""
+        garage = 'garage' in self._products[bike]['href']
+        data = self._extract_script_json(
+            html, self._get_specs_script_attrs(garage))
+        if data is None:
+            return self._parse_prod_specs(
+                self._get_soup(html, page_kind='spec'), garage=garage)
+
+        return self._parse_specs_data(data, garage=garage)
+
     def _parse_prod_specs(self, soup, garage=False):
         """Return dictionary representation of the product's specification."""
+        script = soup.find('script', attrs=self._get_specs_script_attrs(garage))
+        return self._parse_specs_data(json.loads(script.string), garage=garage)
+
+    def _parse_specs_data(self, data: dict, garage=False) -> dict:
+        """Return dictionary representation of the product's specification
+        json data."""
         prod_specs = dict()
 
         # Get correct json data per rei or rei-garage/outlet
         if garage:
-            script = soup.find('script',
-                               attrs={'id': 'page-data'})
-            data = json.loads(script.string)
             specs = data['product']['specifications']['specs']
             prod_details = data['product']['features']
         else:
-            script = soup.find('script',
-                               attrs={'data-client-store': 'product-details'})
-            data = json.loads(script.string)
             specs = data['specs']
             prod_details = data['features']
 
@@ -0,0 +1,140 @@
+"""
+Module for caching fetched scraper pages on disk.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class ResponseCache:
+    """Content addressed on-disk cache of fetched pages.
+
+    Each entry is a json file named by the hash of its request. Entries are
+    fresh for the ttl of their page kind, e.g. 'listing' or 'spec', and the
+    least recently used entries are evicted once the cache grows past
+    max_size bytes.
+    """
+
+    def __init__(self, path, ttls: dict, max_size: int):
+        self._path = path
+        self._ttls = ttls  # page_kind: seconds
+        self._max_size = max_size
+        self._size = None  # bytes on disk, computed on first put()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(url, method='GET', params=None, data=None) -> str:
+        """Return hash key for request."""
+        request = json.dumps([method.upper(), url, params, data],
+                             sort_keys=True, default=str)
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+    def _get_entry_path(self, key) -> str:
+        return os.path.join(self._path, key[:2], f'{key}.json')
+
+    def get(self, key):
+        """Return cached entry dict for key, else None if not cached.
+
+        Reading an entry marks it as recently used.
+        """
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(entry_path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict, page_kind: str) -> bool:
+        """Return True if entry was stored within ttl for page_kind."""
+        ttl = self._ttls.get(page_kind, 0)
+        return time.time() - entry['stored_at'] < ttl
+
+    def put(self, key, url, page_kind, text, **fields) -> dict:
+        """Store fetched page for key and return its entry.
+
+        Extra fields, e.g. etag and last_modified validators, are stored
+        with the entry.
+        """
+        entry = dict(fields, url=url, page_kind=page_kind,
+                     stored_at=time.time(), text=text)
+        self._write(key, entry)
+        return entry
+
+    def update(self, key, **fields):
+        """Update fields of cached entry for key, else None if not cached."""
+        entry = self.get(key)
+        if entry is None:
+            return None
+
+        entry.update(fields)
+        self._write(key, entry)
+        return entry
+
+    def _write(self, key, entry: dict):
+        """Write entry for key and evict entries if past max_size."""
+        entry_path = self._get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # write to temp file first so readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path),
+                                        suffix='.tmp')
+        with open(fd, mode='w', encoding='utf-8') as f:
+            json.dump(entry, f)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._get_disk_size()
+            if os.path.exists(entry_path):
+                self._size -= os.path.getsize(entry_path)
+            os.replace(tmp_path, entry_path)
+            self._size += os.path.getsize(entry_path)
+
+            if self._size > self._max_size:
+                self._evict()
+
+    @staticmethod
+    def get_validators(entry: dict) -> dict:
+        """Return conditional request headers for entry's validators."""
+        headers = dict()
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _list_entries(self) -> list:
+        """Return (last used, size, path) of all cached entries."""
+        entries = list()
+        for dirpath, _, filenames in os.walk(self._path):
+            for filename in filenames:
+                if not filename.endswith('.json'):
+                    continue
+                entry_path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(entry_path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+        return entries
+
+    def _get_disk_size(self) -> int:
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _evict(self):
+        """Remove least recently used entries until within max_size."""
+        entries = sorted(self._list_entries())
+        self._size = sum(size for _, size, _ in entries)
+
+        for _, size, entry_path in entries:
+            if self._size <= self._max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            self._size -= size
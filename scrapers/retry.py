@@ -0,0 +1,90 @@
+"""
+Module for retrying failed scraper requests with jittered exponential backoff.
+"""
+import random
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_AFTER_STATUS_CODES = {429, 503}
+
+
+class RetryPolicy:
+    """Decides whether and how long to wait before retrying a request.
+
+    Args:
+        max_retries: retries allowed for a single request.
+        backoff_factor: base delay in seconds, doubled for every attempt.
+        max_backoff: longest delay in seconds, including Retry-After values.
+        retry_budget: retries allowed across all requests of a crawl, so a
+            failing site can't stall a crawl indefinitely.
+    """
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=60.0,
+                 retry_budget=100):
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._retry_budget = retry_budget
+        self._lock = threading.Lock()
+
+    def get_retry_budget(self) -> int:
+        return self._retry_budget
+
+    def _consume_budget(self) -> bool:
+        """Take one retry from the budget if any remain."""
+        with self._lock:
+            if self._retry_budget <= 0:
+                return False
+            self._retry_budget -= 1
+            return True
+
+    def next_delay(self, attempt: int, retry_after: float = None):
+        """Return seconds to wait before the next attempt, else None if the
+        request shouldn't be retried.
+
+        Args:
+            attempt: number of retries already made for the request.
+            retry_after: seconds requested by the server's Retry-After header.
+        """
+        if attempt >= self._max_retries:
+            return None
+
+        # don't retry if server asks to wait longer than allowed
+        if retry_after is not None and retry_after > self._max_backoff:
+            return None
+
+        if not self._consume_budget():
+            return None
+
+        # equal jitter: wait between half and full backoff
+        backoff = min(self._max_backoff, self._backoff_factor * 2 ** attempt)
+        delay = random.uniform(backoff / 2, backoff)
+
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Return seconds for Retry-After header given as seconds or HTTP-date,
+        else None if missing or invalid."""
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            retry_date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_date.tzinfo is None:
+            retry_date = retry_date.replace(tzinfo=timezone.utc)
+        seconds = (retry_date - datetime.now(timezone.utc)).total_seconds()
+        return max(seconds, 0.0)
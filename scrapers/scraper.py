@@ -1,17 +1,75 @@
+import asyncio
+import functools
+import json
+import multiprocessing
 import os
+import queue
+import re
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from csv import DictWriter, DictReader
+from collections import namedtuple
 from datetime import datetime
+from urllib.parse import urlsplit
 
+import lxml.html
 import requests
 from bs4 import BeautifulSoup
-
+from lxml import etree
+
+from scrapers.rate_limiter import get_host_limiter
+from scrapers.response_cache import ResponseCache
+from scrapers.retry import RetryPolicy
+from scrapers.retry import RETRY_STATUS_CODES, RETRY_AFTER_STATUS_CODES
+from scrapers.session_pool import SessionPool
+from scrapers.spec_checkpoint import SpecCheckpoint
 from utils.utils import RAW_DATA_PATH, TIMESTAMP
-from utils.utils import create_directory_if_missing
+from utils.utils import create_directory_if_missing, scraper_settings
+from utils.utils import record_spec_fieldnames
+
+# text of fetched page, status is 'fetched', 'cached' or 'not_modified' and
+# specs are the previously parsed specs of a not modified page, if any
+FetchedPage = namedtuple('FetchedPage', ['text', 'status', 'cache_key', 'specs'])
+
+_SCRIPT_TAG_RE = re.compile(r'<script\b([^>]*)>', re.IGNORECASE)
+_SCRIPT_END_RE = re.compile(r'</script\s*>', re.IGNORECASE)
+_TAG_ATTR_RE = re.compile(
+    r'([^\s=/>]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+# url attributes lxml's html serializer percent-escapes, and the characters
+# it leaves as they are
+_URL_ATTRS = ('href', 'src', 'action', 'name')
+_URL_ESCAPED_RE = re.compile(r"[^\w\-.!~*'()@/:=?;#%&,+<>]", re.ASCII)
+
+_WORKER_SCRAPER = None  # scraper parsing spec pages in a parse worker process
+
+
+def _init_parse_worker(scraper):
+    global _WORKER_SCRAPER
+    _WORKER_SCRAPER = scraper
+
+
+def _parse_spec_page_in_worker(bike, product: dict, html) -> tuple:
+    """Return (parsed specs, spec fieldnames) of bike product's page."""
+    scraper = _WORKER_SCRAPER
+    scraper._products = {bike: product}
+    scraper._specs_fieldnames = set()
+    result = scraper._parse_spec_page(bike, html)
+    return result, scraper._specs_fieldnames
 
 
 class Scraper(ABC):
+    _DEFAULT_HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/78.0.3904.108 Safari/537.36',
+        'Connection': 'keep-alive'
+    }
+    _PARSE_IN_PROCESS = True  # False if _parse_prod_specs() fetches pages
+    # page_kind: [(tag name or None, attrs)] of page regions _get_soup() parses
+    # instead of the whole page, e.g. {'spec': [('div', {'id': 'specs'})]}, or
+    # a list of (tag name or None, attrs) alternatives where layouts differ
+    _PAGE_REGIONS = {}
+
     def __init__(self, base_url, source, save_data_path=RAW_DATA_PATH):
         self._BASE_URL = base_url
         self._SOURCE = source
@@ -21,30 +79,158 @@ class Scraper(ABC):
         self._num_bikes = 0
         self._specs_fieldnames = {'site', 'product_id', 'details'}
         self._bike_type = 'all'
+        self._spec_queue = None  # set while pipelined crawl is running
+        self._settings = scraper_settings(source)
+        self._concurrency = self._settings['concurrency']
+        self._session_pool = SessionPool(
+            pool_size=max(self._settings['pool_size'], self._concurrency),
+            headers=self._DEFAULT_HEADERS)
+        self._retry_policy = RetryPolicy(
+            max_retries=self._settings['max_retries'],
+            backoff_factor=self._settings['backoff_factor'],
+            max_backoff=self._settings['max_backoff'],
+            retry_budget=self._settings['retry_budget'])
+        self._response_cache = None
+        if self._settings['cache']:
+            self._response_cache = ResponseCache(
+                path=os.path.join(self._DATA_PATH, 'http_cache'),
+                ttls={'listing': self._settings['cache_listing_ttl'],
+                      'spec': self._settings['cache_spec_ttl']},
+                max_size=self._settings['cache_max_mb'] * 1024 * 1024)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getstate__(self):
+        """Return state for parse worker processes, without this process's
+        sessions, locks, caches and products."""
+        state = self.__dict__.copy()
+        state.update(_session_pool=None, _retry_policy=None,
+                     _response_cache=None, _spec_queue=None, _products=dict())
+        return state
+
+    def get_bike_type(self) -> str:
+        return self._bike_type
+
+    def close(self):
+        """Close pooled sessions and their keep-alive connections."""
+        self._session_pool.close()
+
+    def _get_rate_limiter(self, url):
+        """Return shared token bucket for the host of given url."""
+        return get_host_limiter(host=urlsplit(url).netloc,
+                                rate=self._settings['rate_limit'],
+                                burst=self._settings['burst'])
+
+    def _fetch_html(self, url, method='GET', params=None, data=None,
+                    headers=None, page_kind='listing'):
+        """Fetch html page for bikes.
+
+        Raises:
+            FileNotFoundError - If request fails and can't be retried.
+        """
+        return self._fetch_page(url, method=method, params=params, data=data,
+                                headers=headers, page_kind=page_kind).text
 
-    @staticmethod
-    def _fetch_html(url, method='GET', params=None, data=None,
-                    headers=None):
-        """Fetch html page for bikes"""
+    def _fetch_page(self, url, method='GET', params=None, data=None,
+                    headers=None, page_kind='listing') -> FetchedPage:
+        """Fetch page for bikes through the response cache, if enabled.
+
+        GET requests are served from cache while the cached page is within
+        the ttl for page_kind ('listing' or 'spec'). Stale pages with ETag or
+        Last-Modified validators are revalidated with a conditional request
+        and reused if the site responds 304 Not Modified.
+
+        Raises:
+            FileNotFoundError - If request fails and can't be retried.
+        """
+        cache_key = None
+        entry = None
+        if self._response_cache is not None and method == 'GET':
+            cache_key = self._response_cache.get_key(url, method, params, data)
+            entry = self._response_cache.get(cache_key)
+            if entry is not None and self._response_cache.is_fresh(entry,
+                                                                   page_kind):
+                print(f'Using cached {page_kind} page for: {url}')
+                return FetchedPage(entry['text'], 'cached', cache_key, None)
+
+            if entry is not None:
+                validators = self._response_cache.get_validators(entry)
+                headers = dict(headers or {}, **validators) or None
+
+        response = self._request(url, method=method, params=params,
+                                 data=data, headers=headers,
+                                 not_modified_ok=entry is not None)
+
+        if cache_key is None:
+            return FetchedPage(response.text, 'fetched', None, None)
+
+        if response.status_code == 304:
+            print(f'Not modified, using cached {page_kind} page for: {url}')
+            entry = self._response_cache.update(
+                cache_key, stored_at=time.time()) or entry
+            return FetchedPage(entry['text'], 'not_modified', cache_key,
+                               entry.get('specs'))
+
+        self._response_cache.put(
+            cache_key, url=url, page_kind=page_kind, text=response.text,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'))
+        return FetchedPage(response.text, 'fetched', cache_key, None)
+
+    def _request(self, url, method='GET', params=None, data=None,
+                 headers=None, not_modified_ok=False):
+        """Send request using the pooled session for its host.
+
+        Timeouts, connection errors and retryable status codes are retried
+        with jittered exponential backoff, honoring Retry-After headers.
+
+        Returns:
+            successful response object, including 304 responses if
+            not_modified_ok.
 
-        # Configure default header values
-        if headers is None:
-            headers = dict()
-        headers['User-Agent'] = 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/78.0.3904.108 Safari/537.36'
-        headers['Connection'] = 'keep-alive'
+        Raises:
+            FileNotFoundError - If request fails and can't be retried.
+        """
+        session = self._session_pool.get_session(url)
+        attempt = 0
+
+        while True:
+            self._get_rate_limiter(url).acquire()
+            print(f'Performing {method} request for: {url}')
+            retry_after = None
+            try:
+                response = session.request(method=method, url=url, data=data,
+                                           params=params, headers=headers,
+                                           timeout=self._settings['timeout'])
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = f'{type(e).__name__}: {e}'
+            else:
+                # check response status code
+                if response.status_code == 200:
+                    return response
+                if response.status_code == 304 and not_modified_ok:
+                    return response
 
-        print(f'Performing {method} request for: {url}')
-        with requests.Session() as req_sess:
-            response = req_sess.request(method=method, url=url, data=data,
-                                        params=params, headers=headers)
+                error = (f'HTTPError - Status Code: {response.status_code}; '
+                         f'Reason: {response.reason}')
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise FileNotFoundError(error)
 
-        # check response status code
-        if response.status_code != 200:
-            raise FileNotFoundError(
-                f'HTTPError - Status Code: {response.status_code}; Reason: '
-                f'{response.reason}')
+                if response.status_code in RETRY_AFTER_STATUS_CODES:
+                    retry_after = self._retry_policy.parse_retry_after(
+                        response.headers.get('Retry-After'))
 
-        return response.text
+            delay = self._retry_policy.next_delay(attempt, retry_after)
+            if delay is None:
+                raise FileNotFoundError(error)
+
+            attempt += 1
+            print(f'\t{error} - retry {attempt} in {delay:.2f} seconds')
+            time.sleep(delay)
 
     @abstractmethod
     def _fetch_prod_listing_view(self, **kwargs):
@@ -72,6 +258,13 @@ class Scraper(ABC):
         """Get all bike products for the passed html page"""
         pass
 
+    def _add_product(self, prod_id, product: dict):
+        """Add product found on listings page, queueing it for its specs
+        page if a pipelined crawl is running."""
+        self._products[prod_id] = product
+        if self._spec_queue is not None:
+            self._spec_queue.put(prod_id)
+
     @abstractmethod
     def _parse_prod_specs(self, soup):
         """Return dictionary representation of the product's specification.
@@ -104,9 +297,13 @@ class Scraper(ABC):
             'date_loaded': None
         }
 
-    def _write_prod_specs_to_csv(self, specs: dict,
+    def _write_prod_specs_to_csv(self, specs,
                                  bike_type: str = '') -> dict:
-        """Save bike product specifications to csv file."""
+        """Save bike product specifications to csv file.
+
+        Args:
+            specs: dict of spec rows by product or iterable of spec rows.
+        """
         if not bike_type:
             bike_type = self._bike_type
 
@@ -119,9 +316,15 @@ class Scraper(ABC):
             writer = DictWriter(csvfile, fieldnames=self._specs_fieldnames)
             writer.writeheader()
 
-            for values in specs.values():
+            if isinstance(specs, dict):
+                specs = specs.values()
+
+            for values in specs:
                 writer.writerow(values)
 
+        # index header so schema discovery doesn't reopen the file
+        record_spec_fieldnames(self._DATA_PATH, path, self._specs_fieldnames)
+
         # return manifest row object of csv data
         return {
             'site': self._SOURCE, 'tablename': 'product_specs',
@@ -135,14 +338,8 @@ class Scraper(ABC):
         """Get all products currently available from site"""
         pass
 
-    def get_product_specs(self, get_prods_from='site', bike_type: str = '',
-                          to_csv=True) -> dict:
-        """Get specifications for all available bikes on web site.
-        
-        Returns:
-            manifest row data if written to csv, else specs dict object.
-        """
-        # determine how to get bike products
+    def _load_products(self, get_prods_from='site'):
+        """Populate self._products from memory, site, or products CSV file."""
         if self._products and get_prods_from == 'memory':
             print('\nHave bike products listing in memory - PROCESSING...')
         elif get_prods_from == 'site':
@@ -169,58 +366,502 @@ class Scraper(ABC):
         else:
             raise ValueError('No products available!')
 
-        start_timer = datetime.now()  # time how long to scrape all specs
-        specs = dict()
+    def _get_product_url(self, bike) -> str:
+        """Return specifications page url for given bike product."""
+        bike_href = self._products[bike]['href']
 
-        # iteratively get specifications page for each bike
-        for bike in self._products:
-            print(f'Fetching specifications for: {bike}')
-            # define bike specifications url
-            bike_href = self._products[bike]['href']
-            bike_id = self._products[bike]['product_id']
+        if self._BASE_URL in bike_href:
+            return bike_href
 
-            if self._BASE_URL in bike_href:
-                bike_url = bike_href
-            else:
-                bike_url = self._BASE_URL + bike_href
+        return self._BASE_URL + bike_href
 
-            # wait 10th of a second every 50 specs parsed
-            if len(specs) % 50 == 0:
-                time.sleep(0.10)
-            try:
-                bike_spec_soup = BeautifulSoup(self._fetch_html(url=bike_url),
-                                               'lxml')
-                # For REI check for garage products
-                if self._SOURCE == 'rei' and 'garage' in bike_href:
-                    result = self._parse_prod_specs(bike_spec_soup,
-                                                    garage=True)
-                else:
-                    result = self._parse_prod_specs(bike_spec_soup)
-
-                # some sites have multiple product specs options available
-                # they're returned as a list instead of dict, so process
-                # these product specs accordingly
-                if isinstance(result, list):
-                    for item in result:
-                        specs[bike] = item
+    @staticmethod
+    def _get_region_alternatives(region) -> list:
+        """Return (tag name, attrs) alternatives of declared region."""
+        return region if isinstance(region, list) else [region]
+
+    @staticmethod
+    def _matches_region(element, name, attrs: dict) -> bool:
+        """Return True if lxml element is the (tag name, attrs) region."""
+        if name is not None and element.tag != name:
+            return False
+        for attr, value in attrs.items():
+            if attr == 'class':
+                if value not in (element.get('class') or '').split():
+                    return False
+            elif element.get(attr) != value:
+                return False
+        return True
+
+    def _get_regions_xpath(self, regions: list) -> str:
+        """Return xpath matching any of the (tag name, attrs) regions."""
+        paths = list()
+        alternatives = [alternative for region in regions for alternative
+                        in self._get_region_alternatives(region)]
+        for name, attrs in alternatives:
+            path = f'//{name or "*"}'
+            for attr, value in attrs.items():
+                if attr == 'class':
+                    path += ('[contains(concat(" ", normalize-space(@class), '
+                             f'" "), " {value} ")]')
                 else:
-                    specs[bike] = result
+                    path += f'[@{attr}="{value}"]'
+            paths.append(path)
+        return ' | '.join(paths)
+
+    def _get_soup(self, html, page_kind='listing') -> BeautifulSoup:
+        """Return soup of page's regions declared in _PAGE_REGIONS for
+        page_kind, else of the whole page if none are declared or any of them
+        isn't found.
+
+        Regions are located with lxml and only their markup is built into a
+        soup, which is far cheaper than building the soup of a whole page.
+        """
+        regions = self._PAGE_REGIONS.get(page_kind)
+        if not regions:
+            return BeautifulSoup(html, 'lxml')
+
+        try:
+            root = lxml.html.fromstring(html)
+        except (etree.ParserError, ValueError):
+            return BeautifulSoup(html, 'lxml')
+
+        # keep outermost matches, nested ones are part of their markup
+        matched = set()
+        outermost = list()
+        for element in root.xpath(self._get_regions_xpath(regions)):
+            matched.add(element)
+            if any(parent in matched for parent in element.iterancestors()):
+                continue
+            outermost.append(element)
+
+        # e.g. page layout changed, parse whole page rather than lose specs
+        missing = [region for region in regions
+                   if not any(self._matches_region(element, *alternative)
+                              for alternative in
+                              self._get_region_alternatives(region)
+                              for element in matched)]
+        if missing:
+            print(f'{self._SOURCE} {page_kind} page regions not found: '
+                  f'{missing}, parsing whole page')
+            return BeautifulSoup(html, 'lxml')
+
+        # url attribute values the serializer would escape, e.g. spaces in
+        # hrefs, are serialized under a placeholder name and restored in soup
+        placeholders = set()
+        for element in outermost:
+            for child in element.iter(etree.Element):
+                for attr in _URL_ATTRS:
+                    value = child.get(attr)
+                    if value is not None and _URL_ESCAPED_RE.search(value):
+                        child.set(f'data-raw-{attr}', value)
+                        del child.attrib[attr]
+                        placeholders.add(attr)
+
+        soup = BeautifulSoup(''.join(
+            etree.tostring(element, encoding='unicode', method='html',
+                           with_tail=False) for element in outermost), 'lxml')
+        for attr in placeholders:
+            for tag in soup.find_all(attrs={f'data-raw-{attr}': True}):
+                tag[attr] = tag.attrs.pop(f'data-raw-{attr}')
+        return soup
+
+    @staticmethod
+    def _extract_script_json(html, attrs: dict):
+        """Return json data of first script block with attrs in page html,
+        else None if there's no such block or it isn't valid json.
+
+        The block is found by scanning the raw text for its script tag, so no
+        soup is built for pages whose data is embedded as json.
+        """
+        for tag in _SCRIPT_TAG_RE.finditer(html):
+            tag_attrs = dict()
+            for attr in _TAG_ATTR_RE.finditer(tag.group(1)):
+                name, *values = attr.groups()
+                tag_attrs[name.lower()] = next(
+                    value for value in values if value is not None)
+
+            if any(tag_attrs.get(name) != value
+                   for name, value in attrs.items()):
+                continue
+
+            end = _SCRIPT_END_RE.search(html, tag.end())
+            if end is None:
+                return None
+            try:
+                return json.loads(html[tag.end():end.start()])
+            except ValueError:
+                return None
+
+        return None
+
+    def _parse_spec_page(self, bike, html):
+        """Parse fetched specifications page for given bike product."""
+        return self._parse_prod_specs(self._get_soup(html, page_kind='spec'))
+
+    @contextmanager
+    def _get_parse_pool(self):
+        """Yield process pool for parsing spec pages if 'parse_workers'
+        setting is set, else None to parse on the event loop thread."""
+        workers = self._settings['parse_workers']
+        if workers <= 0 or not self._PARSE_IN_PROCESS:
+            yield None
+            return
+
+        # spawn, since forking while fetch threads run isn't safe
+        with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_parse_worker,
+                initargs=(self,)) as parse_pool:
+            yield parse_pool
+
+    async def _fetch_product_spec(self, loop, executor, semaphores,
+                                  bike, on_spec, parse_pool=None):
+        """Fetch and parse specifications page for bike product, passing the
+        specs to on_spec(bike, specs) as soon as they're available.
+
+        Fetching runs on the executor so other requests stay in flight, while
+        parsing runs on parse_pool processes, if any, else on the event loop
+        thread which keeps the site's _parse_prod_specs() hooks single
+        threaded.
+        """
+        on_spec(bike, self._finalize_spec(
+            bike, await self._fetch_spec_result(loop, executor, semaphores,
+                                                bike, parse_pool)))
+
+    async def _fetch_spec_result(self, loop, executor, semaphores, bike,
+                                 parse_pool=None):
+        """Return parsed specs dict, or list of dicts, for bike product."""
+        bike_url = self._get_product_url(bike)
+        host = urlsplit(bike_url).netloc
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self._concurrency)
+
+        async with semaphores[host]:
+            print(f'Fetching specifications for: {bike}')
+            try:
+                page = await loop.run_in_executor(
+                    executor, functools.partial(self._fetch_page, url=bike_url,
+                                                page_kind='spec'))
             except FileNotFoundError:
                 print(f'\tSpecifications page for {bike} not found!')
-                specs[bike] = {}
+                return {}
+
+        # reuse parsed specs if page not modified since last crawl
+        if page.specs is not None:
+            self._add_specs_fieldnames(page.specs)
+            return page.specs
+
+        # parse outside semaphore so next request can go out meanwhile
+        if parse_pool is None:
+            result = self._parse_spec_page(bike, page.text)
+        else:
+            result, fieldnames = await loop.run_in_executor(
+                parse_pool, _parse_spec_page_in_worker, bike,
+                self._products[bike], page.text)
+            self._specs_fieldnames.update(fieldnames)
+
+        if page.cache_key is not None:
+            self._response_cache.update(page.cache_key, specs=result)
+        return result
+
+    def _finalize_spec(self, bike, result) -> dict:
+        """Return spec row for bike product's parsed specs."""
+        # some sites have multiple product specs options available
+        # they're returned as a list instead of dict, so process
+        # these product specs accordingly
+        if isinstance(result, list):
+            spec = dict()
+            for item in result:
+                spec = item
+        else:
+            spec = result
+
+        # ensure primary key fields are added
+        spec['product_id'] = self._products[bike]['product_id']
+        spec['site'] = self._SOURCE
+        return spec
+
+    def _add_specs_fieldnames(self, result):
+        """Add fieldnames of previously parsed specs dict or list of dicts."""
+        for item in result if isinstance(result, list) else [result]:
+            self._specs_fieldnames.update(item.keys())
+
+    async def _gather_product_specs(self, bikes: list, on_spec):
+        """Fetch specs for bike products keeping concurrency requests in
+        flight per host, passing each to on_spec(bike, specs)."""
+        loop = asyncio.get_running_loop()
+        semaphores = dict()  # host: asyncio.Semaphore
+
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor, \
+                self._get_parse_pool() as parse_pool:
+            tasks = [
+                self._fetch_product_spec(loop, executor, semaphores, bike,
+                                         on_spec, parse_pool)
+                for bike in bikes
+            ]
+            await asyncio.gather(*tasks)
+
+    async def _consume_product_specs(self, spec_queue, on_spec, skip_bike):
+        """Fetch specs for bike products as they're put on spec_queue, until
+        None is put, passing each to on_spec(bike, specs).
+
+        Args:
+            skip_bike: skip_bike(bike) returns True if bike's specs page
+                doesn't need fetching.
+        """
+        loop = asyncio.get_running_loop()
+        semaphores = dict()  # host: asyncio.Semaphore
+        queued = set()  # products can be listed under several subtypes
+        tasks = list()
+
+        with ThreadPoolExecutor(max_workers=self._concurrency) as executor, \
+                self._get_parse_pool() as parse_pool:
+            while True:
+                bike = await loop.run_in_executor(None, spec_queue.get)
+                if bike is None:
+                    break
+                if bike in queued or skip_bike(bike):
+                    queued.add(bike)
+                    continue
+                queued.add(bike)
+                tasks.append(asyncio.ensure_future(self._fetch_product_spec(
+                    loop, executor, semaphores, bike, on_spec, parse_pool)))
+            await asyncio.gather(*tasks)
+
+    @staticmethod
+    def _read_csv_rows(filepath) -> dict:
+        """Return non-empty values of CSV file rows keyed by product_id."""
+        rows = dict()
+        with open(file=filepath, mode='r', encoding='utf-8') as csv_file:
+            for row in DictReader(csv_file):
+                rows[row['product_id']] = {k: v for k, v in row.items() if v}
+        return rows
+
+    def _read_previous(self, previous: dict) -> tuple:
+        """Return (specs, products) rows by product_id of previous crawl files.
+
+        Args:
+            previous: {tablename: filepath} for previous 'product_specs' and,
+                optionally, 'products' files, e.g. from get_table_pairs().
+        """
+        specs_path = previous.get('product_specs')
+        if not specs_path or not os.path.exists(specs_path):
+            return dict(), dict()
+
+        previous_prods = dict()
+        prods_path = previous.get('products')
+        if prods_path and os.path.exists(prods_path):
+            previous_prods = self._read_csv_rows(prods_path)
 
-            # ensure primary key fields are added
-            specs[bike]['product_id'] = bike_id
-            specs[bike]['site'] = self._SOURCE
+        return self._read_csv_rows(specs_path), previous_prods
+
+    def _get_carried_spec(self, bike, previous_specs: dict,
+                          previous_prods: dict):
+        """Return previous specs for bike product if they can be carried
+        over, else None if its specs page needs fetching.
+
+        Products are fetched if they're new, had no specs, or their href or
+        price changed since the previous products file.
+        """
+        product = self._products[bike]
+        prod_id = product['product_id']
+        spec = previous_specs.get(prod_id, {})
+        prev_product = previous_prods.get(prod_id)
+
+        changed = prev_product is not None and any(
+            prev_product.get(field, '') != str(product.get(field, ''))
+            for field in ['href', 'price'])
+
+        if changed or not set(spec).difference({'site', 'product_id'}):
+            return None
+
+        self._add_specs_fieldnames(spec)
+        return spec
+
+    def _get_changed_products(self, previous: dict) -> tuple:
+        """Split products into those needing their specs fetched and those
+        whose specs can be carried over from the previous crawl.
+
+        Returns:
+            (list of bikes to fetch, dict of carried over specs by bike)
+        """
+        previous_specs, previous_prods = self._read_previous(previous)
+
+        bikes = list()
+        carried_specs = dict()
+        for bike in self._products:
+            spec = self._get_carried_spec(bike, previous_specs, previous_prods)
+            if spec is None:
+                bikes.append(bike)
+            else:
+                carried_specs[bike] = spec
+
+        return bikes, carried_specs
+
+    @staticmethod
+    def _run_coroutine(coroutine):
+        """Run coroutine to completion, even if an event loop is running."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        # e.g. inside notebooks - run in a separate thread with its own loop
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+
+    def _get_checkpoint(self, bike_type: str) -> SpecCheckpoint:
+        """Return specs checkpoint for source and bike_type."""
+        fname = f'{self._SOURCE}_specs_{bike_type}.jsonl'
+        return SpecCheckpoint(os.path.join(self._DATA_PATH, 'checkpoints',
+                                           fname))
+
+    def _open_checkpoint(self, checkpoint: SpecCheckpoint, resume) -> set:
+        """Return bikes already captured in checkpoint if resume, else clear
+        checkpoint and return empty set.
+
+        On resume, a line left incomplete by an interrupted write is
+        truncated first so the next appended specs start on a new line.
+        """
+        captured = set()
+        if not resume:
+            checkpoint.clear()
+            return captured
+
+        checkpoint.truncate_incomplete()
+        for bike, spec in checkpoint.iter_specs():
+            captured.add(bike)
+            self._add_specs_fieldnames(spec)
+        print(f'Resuming: {len(captured)} products already captured in '
+              f'{checkpoint.get_path()}')
+        return captured
+
+    def get_product_specs(self, get_prods_from='site', bike_type: str = '',
+                          to_csv=True, concurrency: int = None,
+                          previous: dict = None, resume=False) -> dict:
+        """Get specifications for all available bikes on web site.
+
+        When saving to csv, specs are streamed to an append-only checkpoint
+        file as they're scraped and the csv is written from the checkpoint
+        once all products are done.
+
+        Args:
+            concurrency: max spec requests in flight per host. Defaults to
+                the 'concurrency' scraper setting.
+            previous: {tablename: filepath} of previous crawl files. If
+                provided, only fetch specs for new or changed products and
+                carry over the rest from the previous 'product_specs' file.
+            resume: if True, skip products already captured in checkpoint of
+                an interrupted crawl.
+
+        Returns:
+            manifest row data if written to csv, else specs dict object.
+        """
+        self._load_products(get_prods_from)
+
+        if concurrency is not None:
+            self._concurrency = concurrency
+
+        start_timer = datetime.now()  # time how long to scrape all specs
+        bikes = list(self._products)
+        carried_specs = dict()
+        if previous:
+            bikes, carried_specs = self._get_changed_products(previous)
+            print(f'Incremental: fetching specs for {len(bikes)} of '
+                  f'{len(self._products)} products')
+
+        if not to_csv:
+            specs = dict()
+            for bike, spec in carried_specs.items():
+                specs[bike] = self._finalize_spec(bike, spec)
+            self._run_coroutine(self._gather_product_specs(
+                bikes, on_spec=specs.__setitem__))
+
+            running_time = (datetime.now() - start_timer)
+            print(f'Runtime for scraping specs: {running_time}')
+            return {bike: specs[bike] for bike in self._products}
+
+        checkpoint = self._get_checkpoint(bike_type or self._bike_type)
+        captured = self._open_checkpoint(checkpoint, resume)
+        bikes = [bike for bike in bikes if bike not in captured]
+        carried_specs = {bike: spec for bike, spec in carried_specs.items()
+                         if bike not in captured}
+
+        for bike, spec in carried_specs.items():
+            checkpoint.append(bike, self._finalize_spec(bike, spec))
+        self._run_coroutine(self._gather_product_specs(
+            bikes, on_spec=checkpoint.append))
 
         running_time = (datetime.now() - start_timer)
         print(f'Runtime for scraping specs: {running_time}')
 
-        if to_csv:
-            return self._write_prod_specs_to_csv(specs=specs,
-                                                 bike_type=bike_type)
+        row = self._write_prod_specs_to_csv(
+            specs=(spec for _, spec in checkpoint.iter_specs()),
+            bike_type=bike_type)
+        checkpoint.remove()
+        return row
+
+    def get_all_available_prods_and_specs(self, concurrency: int = None,
+                                          previous: dict = None,
+                                          resume=False) -> list:
+        """Get all available bikes and their specifications on web site,
+        fetching specs pages while listing pages are still being crawled.
+
+        Products are queued for their specs page as soon as they're found on
+        a listings page, instead of after every listings page is done.
+
+        Args:
+            concurrency: max spec requests in flight per host.
+            previous: {tablename: filepath} of previous crawl files, carry
+                over specs of unchanged products.
+            resume: if True, skip products already captured in checkpoint of
+                an interrupted crawl.
+
+        Returns:
+            manifest rows for products csv files and specs csv file.
+        """
+        if concurrency is not None:
+            self._concurrency = concurrency
+
+        start_timer = datetime.now()
+        previous_specs, previous_prods = self._read_previous(previous or {})
+        checkpoint = self._get_checkpoint(self._bike_type)
+        captured = self._open_checkpoint(checkpoint, resume)
+
+        def skip_bike(bike):
+            if bike in captured:
+                return True
+            spec = self._get_carried_spec(bike, previous_specs, previous_prods)
+            if spec is None:
+                return False
+            checkpoint.append(bike, self._finalize_spec(bike, spec))
+            return True
+
+        spec_queue = queue.Queue()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            consumer = executor.submit(
+                asyncio.run, self._consume_product_specs(
+                    spec_queue, on_spec=checkpoint.append,
+                    skip_bike=skip_bike))
+
+            self._spec_queue = spec_queue
+            try:
+                rows = self.get_all_available_prods()
+            finally:
+                # let queued specs finish so they're checkpointed for resume
+                self._spec_queue = None
+                spec_queue.put(None)
+                consumer.result()
+
+        running_time = (datetime.now() - start_timer)
+        print(f'Runtime for scraping products and specs: {running_time}')
 
-        return specs
+        rows.append(self._write_prod_specs_to_csv(
+            specs=(spec for _, spec in checkpoint.iter_specs())))
+        checkpoint.remove()
+        return rows
 
     @staticmethod
     def _normalize_spec_fieldnames(fieldname: str) -> str:
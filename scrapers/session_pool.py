@@ -0,0 +1,63 @@
+"""
+Module for pooling reusable keep-alive HTTP sessions for the scrapers.
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+    """Keeps one keep-alive requests.Session per host.
+
+    Each session mounts an HTTPAdapter sized to pool_size so that listing
+    and spec pages fetched from the same site reuse open connections instead
+    of paying a new TCP+TLS handshake for every request.
+    """
+
+    def __init__(self, pool_size=10, headers=None):
+        self._pool_size = pool_size
+        self._headers = dict() if headers is None else dict(headers)
+        self._sessions = dict()
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Return new session with sized connection pool and default headers."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self._pool_size,
+                              pool_maxsize=self._pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.headers.update(self._headers)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """Return the shared session for the host of given url."""
+        host = urlsplit(url).netloc
+
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host] = session
+
+        return session
+
+    def get_hosts(self) -> list:
+        """Return hosts with an open session."""
+        with self._lock:
+            return list(self._sessions.keys())
+
+    def close(self):
+        """Close all sessions and release their pooled connections."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = dict()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,81 @@
+"""
+Module for checkpointing product specs while they're scraped.
+"""
+import json
+import os
+import threading
+
+from utils.utils import create_directory_if_missing
+
+
+class SpecCheckpoint:
+    """Append-only json lines file of scraped product specs.
+
+    Specs are appended as soon as they're parsed so an interrupted crawl can
+    be resumed without fetching captured products again.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._lock = threading.Lock()
+
+    def get_path(self) -> str:
+        return self._path
+
+    def clear(self):
+        """Start an empty checkpoint, discarding any captured specs."""
+        create_directory_if_missing(self._path)
+        with self._lock:
+            open(self._path, mode='w', encoding='utf-8').close()
+
+    def append(self, bike, specs: dict):
+        """Append specs for bike product to checkpoint file."""
+        line = json.dumps({'bike': bike, 'specs': specs}) + '\n'
+        create_directory_if_missing(self._path)
+        with self._lock:
+            with open(self._path, mode='a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+
+    def truncate_incomplete(self):
+        """Truncate checkpoint file back to its last complete line, so specs
+        appended on resume don't land on a line left by an interrupted write.
+        """
+        with self._lock:
+            if not os.path.exists(self._path):
+                return
+
+            with open(self._path, mode='rb+') as f:
+                size = end = f.seek(0, os.SEEK_END)
+                while end > 0:  # scan back in blocks for last newline
+                    start = max(end - 4096, 0)
+                    f.seek(start)
+                    newline = f.read(end - start).rfind(b'\n')
+                    end = start if newline == -1 else start + newline + 1
+                    if newline != -1:
+                        break
+                if end < size:
+                    print(f'Truncating incomplete line in {self._path}')
+                    f.truncate(end)
+
+    def iter_specs(self):
+        """Yield (bike, specs) tuples captured in checkpoint file.
+
+        Lines left incomplete by an interrupted write are skipped.
+        """
+        if not os.path.exists(self._path):
+            return
+
+        with open(self._path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    captured = json.loads(line)
+                except ValueError:
+                    continue
+                yield captured['bike'], captured['specs']
+
+    def remove(self):
+        """Delete checkpoint file once its specs are saved."""
+        with self._lock:
+            if os.path.exists(self._path):
+                os.remove(self._path)
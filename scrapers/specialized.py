@@ -11,6 +11,11 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Specialized(Scraper):
+    _PAGE_REGIONS = {
+        'spec': [(None, {'id': 'tab1'}),
+                 ('div', {'class': 'product__specs-table'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.specialized.com',
                          source='specialized', save_data_path=save_data_path)
@@ -94,7 +99,7 @@ class Specialized(Scraper):
                 price = price.strip('$').replace(',', '')
             product['price'] = float(price)
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
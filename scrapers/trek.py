@@ -3,12 +3,19 @@ Module for scraping trek.com for its bike data.
 """
 import math
 
-from bs4 import BeautifulSoup
-
 from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Trek(Scraper):
+    _PAGE_REGIONS = {
+        'categories': [('fieldset', {'name': 'Category'})],
+        'listing': [('ul', {'class': 'product-list'}),
+                    ('nav', {'class': 'pagination'})],
+        'spec': [(None, {'id': 'overview'}),
+                 [('section', {'id': 'trekProductSpecificationsComponent'}),
+                  ('section', {'id': 'trekProductSpecificationsComponentBOM'})]]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH):
         super().__init__(base_url='https://www.trekbikes.com',
                          source='trek', save_data_path=save_data_path)
@@ -62,7 +69,7 @@ class Trek(Scraper):
                    'womens_bikes', 'kids_bikes',
                    'show_all', 'show_less']
         page = self._fetch_prod_listing_view(self._PROD_PAGE_ENDPOINT)
-        soup = BeautifulSoup(page, 'lxml')
+        soup = self._get_soup(page, 'categories')
         return self._parse_categories(soup, exclude)
 
     def _get_subtypes(self) -> dict:
@@ -77,9 +84,9 @@ class Trek(Scraper):
                    'womens_commuter_bikes', 'show_all', 'show_less']
         categories = self._get_categories()
         for bike_type, href in categories.items():
-            soup = BeautifulSoup(
+            soup = self._get_soup(
                 self._fetch_prod_listing_view(endpoint=href),
-                'lxml'
+                'categories'
             )
             subtypes[bike_type] = self._parse_categories(soup, exclude)
 
@@ -96,20 +103,20 @@ class Trek(Scraper):
         for bike_type, subtypes in categories.items():
             for subtype, href in subtypes.items():
                 print(f'Getting {bike_type}:{subtype}...')
-                soup = BeautifulSoup(self._fetch_prod_listing_view(
-                    endpoint=href, page_size=self._PAGE_SIZE), 'lxml')
+                soup = self._get_soup(self._fetch_prod_listing_view(
+                    endpoint=href, page_size=self._PAGE_SIZE), 'listing')
                 self._get_prods_on_current_listings_page(
                     soup, bike_type, subtype
                 )
                 next_page, href = self._next_page(soup)
 
                 while next_page:
-                    soup = BeautifulSoup(
+                    soup = self._get_soup(
                         self._fetch_prod_listing_view(
                             endpoint=href,
                             page_size=self._PAGE_SIZE
                         ),
-                        'lxml'
+                        'listing'
                     )
                     self._get_prods_on_current_listings_page(
                         soup, bike_type, subtype
@@ -162,7 +169,7 @@ class Trek(Scraper):
                 low = float(msrp.replace(',', '').split('-')[0].strip().strip('$'))
                 product['msrp'] = low
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup) -> dict:
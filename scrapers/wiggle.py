@@ -8,6 +8,13 @@ from scrapers.scraper import Scraper, RAW_DATA_PATH
 
 
 class Wiggle(Scraper):
+    _PAGE_REGIONS = {
+        'listing': [('div', {'id': 'search-results'})],
+        'spec': [('div', {'class': 'bem-pdp__pricing'}),
+                 ('div', {'class': 'bem-pdp__product-description--written'}),
+                 ('div', {'class': 'bem-pdp__product-description--tabular'})]
+    }
+
     def __init__(self, save_data_path=RAW_DATA_PATH, page_size=96):
         """Class for scraping www.wiggle.com website.
 
@@ -148,7 +155,7 @@ class Wiggle(Scraper):
                 product['price'] = -1
                 product['msrp'] = -1
 
-            self._products[prod_id] = product
+            self._add_product(prod_id, product)
             print(f'[{len(self._products)}] New bike: ', product)
 
     def _parse_prod_specs(self, soup):
@@ -209,10 +216,10 @@ class Wiggle(Scraper):
                 for i in range(num_pages):
                     print(f'\nParsing page {i + 1} for {bike_type}:{subtype}...')
                     prod_num = i * 96 + 1  # set query str for next page
-                    soup = BeautifulSoup(
+                    soup = self._get_soup(
                         self._fetch_prod_listing_view(page_url, prod_num=prod_num,
                                                       page_size=self._page_size),
-                        'lxml'
+                        'listing'
                     )
                     self._get_prods_on_current_listings_page(
                         soup, bike_type, subtype
@@ -0,0 +1,50 @@
+# python modules
+import subprocess
+import sys
+import unittest
+
+# package modules
+from utils.utils import ROOT_PATH
+
+HEAVY_MODULES = ['bs4', 'lxml', 'numpy', 'pandas', 'psycopg2', 'requests',
+                 'scrapers']
+
+
+def _imported(code: str) -> list:
+    """Return heavyweight modules imported after running code in a fresh
+    interpreter."""
+    code += ('\nimport sys\n'
+             'print(",".join(m for m in %r if m in sys.modules))'
+             % HEAVY_MODULES)
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT_PATH,
+                            capture_output=True, text=True, check=True)
+    return [m for m in result.stdout.strip().split(',') if m]
+
+
+class EtlTestCase(unittest.TestCase):
+    def test_startup_imports(self):
+        """Test importing etl and building the mediator skips heavy modules."""
+        # case 1: importing etl
+        self.assertEqual([], _imported('import etl'))
+
+        # case 2: building the mediator
+        self.assertEqual([], _imported('import etl\n'
+                                       'etl.IngestionMediator()'))
+
+    def test_subcommand_imports(self):
+        """Test each subcommand only imports the modules it needs."""
+        setup = 'import etl\nmediator = etl.IngestionMediator()\n'
+
+        # case 1: collect imports scraping modules only
+        result = _imported(setup + 'mediator._collect\n'
+                                   'from scrapers.registry import get_scraper_class\n'
+                                   'get_scraper_class("trek")')
+        self.assertEqual(['bs4', 'lxml', 'requests', 'scrapers'], result)
+
+        # case 2: clean imports dataframe modules only
+        result = _imported(setup + 'mediator._cleaner')
+        self.assertEqual(['numpy', 'pandas'], result)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -177,6 +177,22 @@ class CleanerTestCase(unittest.TestCase):
             self.assertTrue(field in cols,
                             msg=f'{field} not in merged columns: {cols}')
 
+    def test_parse_groupset(self):
+        """Test Cleaner._parse_groupset() keeps first match in map order."""
+        desc = pd.Series(['Shimano Ultegra Di2, 11-speed', 'SRAM Force eTap AXS 12sp',
+                          'Shiimano 105 R7000', 'Campagnolo Super Record EPS',
+                          'SRAM XO1 Eagle', 'Raceface Aeffect', 'Shimano Ultegra Di2'])
+
+        # case 1: earliest map key wins over longer or leftmost matches
+        result = self._cleaner._parse_groupset(desc)
+        self.assertEqual(['shimano ultegra', 'sram force', 'shimano 105',
+                          'campagnolo record', 'sram xO', 'race face',
+                          'shimano ultegra'], result.tolist())
+
+        # case 2: NaN and unmatched values
+        result = self._cleaner._match_groupsets(pd.Series([None, 'alloy', 'sora']))
+        self.assertTrue(result[:2].isnull().all())
+        self.assertEqual('shimano sora', result[2])
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,5 @@
+import threading
+import time
 import unittest
 
 from ingestion.collect import Collect
@@ -44,6 +46,40 @@ class ManifestTestCase(unittest.TestCase):
         """Test for Collect.collect_specs_matching()."""
         self._collect.collect_specs_matching(source='competitive', bike_type='kid')
 
+    def test_collect_from_sources_parallel(self):
+        """Test Collect.collect_from_sources(workers=...) runs sources
+        concurrently."""
+        lock = threading.Lock()
+        in_flight = {'now': 0, 'max': 0}
+        collected = list()
+
+        def collect_products_from_source(source, **kwargs):
+            with lock:
+                in_flight['now'] += 1
+                in_flight['max'] = max(in_flight['max'], in_flight['now'])
+            time.sleep(0.1)
+            with lock:
+                in_flight['now'] -= 1
+                collected.append(source)
+            if source == 'failed':
+                raise FileNotFoundError(source)
+
+        self._collect.collect_products_from_source = collect_products_from_source
+        sources = ['a', 'b', 'c', 'd', 'failed']
+
+        # case 1: runtime bounded by slowest source, capped by workers
+        start = time.time()
+        self._collect.collect_from_sources(sources, skip_failed=True, workers=3)
+        self.assertLess(time.time() - start, 0.4)
+        self.assertEqual(3, in_flight['max'])
+        self.assertEqual(sorted(sources), sorted(collected))
+
+        # case 2: failed source raised after all sources collected
+        collected.clear()
+        self.assertRaises(FileNotFoundError, self._collect.collect_from_sources,
+                          sources, skip_failed=False, workers=5)
+        self.assertEqual(len(sources), len(collected))
+
 
 if __name__ == '__main__':
     unittest.main()
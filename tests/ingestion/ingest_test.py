@@ -1,8 +1,18 @@
+import io
+import json
+import os
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from csv import DictReader
+from unittest import mock
 
+import pandas as pd
+
+from ingestion.cleaner import Cleaner
 from ingestion.ingest import Ingest, psycopg2
 from ingestion.ingestion_mediator import IngestionMediator
-from tests.unit_test_utils import DATA_PATH, TEST_DATA_PATH, os
+from utils.unit_test_utils import DATA_PATH, TEST_DATA_PATH
 
 
 class ManifestTestCase(unittest.TestCase):
@@ -93,6 +103,91 @@ class ManifestTestCase(unittest.TestCase):
       filepath=comp_road_spec_filepath)
     self.assertTrue(result, msg='Should load file into database.')
 
+  def test_load_files(self):
+    """Test Ingest.load_files() bulk loads files in one transaction."""
+    self._ingest.connect()
+    self._ingest.drop_table(tablenames=self._ingest._PRODUCTS_TABLENAMES)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      files = list()
+      for i, header in enumerate(['site,product_id,price',
+                                  'site,product_id,hello_world',
+                                  'site,product_id,price']):
+        filepath = os.path.join(tmp_dir, f'products_{i}.csv')
+        with open(filepath, mode='w') as f:
+          f.write(f'{header}\ntrek,{i},{i}\ntrek,0,{i}\n')
+        files.append(('products', filepath))
+
+      # case 1: failed file skipped, rest loaded
+      result = self._ingest.load_files(files)
+      self.assertEqual([True, False, True], result)
+
+      # case 2: first loaded row kept per product
+      cur = self._ingest._conn.cursor()
+      cur.execute('SELECT product_id, price FROM products ORDER BY product_id')
+      self.assertEqual([('0', 0.0), ('2', 2.0)], cur.fetchall())
+      cur.close()
+
+      # case 3: staging tables dropped on commit
+      self.assertFalse({'staging_products'} & self._ingest.get_db_tables())
+
+    self._ingest.close()
+
+  def test_load_file_groups(self):
+    """Test Ingest.load_file_groups() loads groups on pooled connections."""
+    self._ingest.connect(pool_size=3)
+    self._ingest.drop_table(tablenames=self._ingest._PRODUCTS_TABLENAMES)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      groups = dict()
+      for site in ['trek', 'rei', 'wiggle']:
+        filepath = os.path.join(tmp_dir, f'{site}_products.csv')
+        with open(filepath, mode='w') as f:
+          f.write('site,product_id,price\n')
+          for i in range(100):
+            f.write(f'{site},{i},{i}\n')
+        groups[(site, 'products')] = [('products', filepath)]
+
+      # case 1: every group loaded in its own transaction
+      result = self._ingest.load_file_groups(groups, workers=2)
+      self.assertEqual({key: [True] for key in groups}, result)
+
+      # case 2: rows of all groups in table
+      cur = self._ingest._conn.cursor()
+      cur.execute('SELECT site, COUNT(*) FROM products GROUP BY site')
+      self.assertEqual({'trek': 100, 'rei': 100, 'wiggle': 100},
+        dict(cur.fetchall()))
+      cur.close()
+
+    self._ingest.close()
+
+  def test_load_file_groups_pool_size(self):
+    """Test Ingest.load_file_groups() caps workers at free pool connections."""
+    groups = {(site, 'products'): [('products', f'{site}_products.csv')]
+              for site in ['trek', 'rei', 'wiggle']}
+    self._ingest._conn = mock.MagicMock()
+    self._ingest._pool = mock.MagicMock()
+    self._ingest._prepare_tables = mock.MagicMock(return_value=[['site']] * 3)
+    self._ingest._load_files_in_transaction = mock.MagicMock(return_value=[True])
+
+    # case 1: no free connection, groups loaded on held connection
+    self._ingest._pool.maxconn = 1
+    result = self._ingest.load_file_groups(groups, workers=4)
+    self.assertEqual({key: [True] for key in groups}, result)
+    self._ingest._pool.getconn.assert_not_called()
+    for call in self._ingest._load_files_in_transaction.call_args_list:
+      self.assertIs(self._ingest._conn, call[0][0])
+
+    # case 2: workers capped at pool_size - 1
+    self._ingest._pool.maxconn = 3
+    with mock.patch('ingestion.ingest.ThreadPoolExecutor',
+                    wraps=ThreadPoolExecutor) as executor:
+      result = self._ingest.load_file_groups(groups, workers=4)
+    self.assertEqual({key: [True] for key in groups}, result)
+    executor.assert_called_once_with(max_workers=2)
+    self.assertEqual(3, self._ingest._pool.getconn.call_count)
+    self.assertEqual(3, self._ingest._pool.putconn.call_count)
+
   def test_check_for_new_specs_columns(self):
     """Test Ingest._check_for_new_specs_columns()."""
     fieldnames = ['hello', 'world', 'cycling_hard']
@@ -112,5 +207,126 @@ class ManifestTestCase(unittest.TestCase):
     self._ingest.close()
 
 
+  def test_check_for_new_specs_columns_batched(self):
+    """Test Ingest._check_for_new_specs_columns() adds all missing columns
+    with one ALTER TABLE and caches table metadata."""
+    self._ingest._conn = mock.MagicMock()
+    cur = self._ingest._conn.__enter__().cursor().__enter__()
+    self._ingest._db_tables = {'product_specs'}
+    self._ingest._table_columns = {'product_specs': {'site', 'product_id', 'frame'}}
+    self._ingest.set_spec_fieldnames(set())
+
+    # case 1: one statement for every missing column
+    result = self._ingest._check_for_new_specs_columns(
+      ['site', 'product_id', 'frame', 'fork', 'tires'])
+    self.assertEqual({'frame', 'fork', 'tires'}, result)
+    cur.execute.assert_called_once()
+    statement = cur.execute.call_args[0][0]
+    self.assertEqual(1, statement.count('ALTER TABLE'))
+    self.assertIn('ADD COLUMN IF NOT EXISTS fork', statement)
+    self.assertIn('ADD COLUMN IF NOT EXISTS tires', statement)
+    self.assertNotIn('frame', statement)
+
+    # case 2: no statements once columns are known
+    self._ingest.set_spec_fieldnames(set())
+    self._ingest._check_for_new_specs_columns(['fork', 'tires'])
+    cur.execute.assert_called_once()
+
+  def test_get_jsonb_specs_buffer(self):
+    """Test Ingest._get_jsonb_specs_buffer() keeps non-empty specs only."""
+    self._ingest = Ingest(mediator=self._mediator, specs_storage='jsonb')
+    f = io.StringIO('site,product_id,frame,fork\n'
+                    'trek,1,carbon,\n'
+                    'trek,2,"steel, ""lugged""",rigid\n')
+
+    rows = list(DictReader(self._ingest._get_jsonb_specs_buffer(f)))
+    self.assertEqual(['1', '2'], [row['product_id'] for row in rows])
+    self.assertEqual({'frame': 'carbon'}, json.loads(rows[0]['specs']))
+    self.assertEqual({'frame': 'steel, "lugged"', 'fork': 'rigid'},
+      json.loads(rows[1]['specs']))
+
+    # case invalid storage
+    self.assertRaises(ValueError, Ingest, self._mediator, 'hello world')
+
+  def test_load_files_jsonb(self):
+    """Test Ingest.load_files() into JSONB product_specs table."""
+    self._ingest = Ingest(mediator=self._mediator, specs_storage='jsonb')
+    self._ingest.connect()
+    self._ingest.drop_table(tablenames=self._ingest._SPECS_TABLENAMES)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+      filepath = os.path.join(tmp_dir, 'trek_specs.csv')
+      with open(filepath, mode='w') as f:
+        f.write('site,product_id,frame,fork\ntrek,1,carbon,\ntrek,2,steel,rigid\n')
+
+      # case 1: loaded without spec columns
+      self.assertEqual([True], self._ingest.load_files([('product_specs', filepath)]))
+      self.assertEqual({'site', 'product_id', 'specs'},
+        self._ingest._get_table_columns('product_specs'))
+
+      # case 2: specs queried by containment
+      cur = self._ingest._conn.cursor()
+      cur.execute("""SELECT product_id FROM product_specs
+        WHERE specs @> '{"fork": "rigid"}'""")
+      self.assertEqual([('2',)], cur.fetchall())
+      cur.close()
+
+    self._ingest.close()
+
+  def test_load_dataframe(self):
+    """Test Ingest.load_dataframe() streams record batches from memory."""
+    df = pd.DataFrame({'site': ['trek'] * 25, 'product_id': range(25),
+                       'price': [1.5] * 24 + [None], 'description': ['a,b'] * 25})
+    self._ingest._conn = mock.MagicMock()
+    self._ingest._db_tables = set()
+    copied = list()
+    cur = self._ingest._conn.cursor()
+    cur.copy_expert.side_effect = lambda sql, file: copied.append(file.read())
+    create_cur = self._ingest._conn.__enter__().cursor().__enter__()
+
+    # case 1: table created with typed columns
+    self.assertTrue(self._ingest.load_dataframe('munged', df, batch_size=10))
+    statement = create_cur.execute.call_args[0][0]
+    self.assertIn('product_id TEXT', statement)
+    self.assertIn('price DOUBLE PRECISION', statement)
+    self.assertIn('description TEXT', statement)
+    self.assertIn('PRIMARY KEY (site, product_id)', statement)
+
+    # case 2: one COPY per record batch, rows loaded from buffers
+    self.assertEqual(3, len(copied))
+    rows = [row for buffer in copied for row in DictReader(io.StringIO(buffer))]
+    self.assertEqual([str(i) for i in range(25)], [row['product_id'] for row in rows])
+    self.assertEqual('a,b', rows[0]['description'])
+    self.assertEqual('', rows[-1]['price'])
+    self._ingest._conn.commit.assert_called_once()
+
+    # case 3: iterable of data frames
+    copied.clear()
+    self.assertTrue(self._ingest.load_dataframe('munged', iter([df, df]),
+                                                batch_size=20))
+    self.assertEqual(4, len(copied))
+
+  def test_load_dataframe_fixed_schema(self):
+    """Test Ingest.load_dataframe() types columns per munged schema, not dtypes."""
+    self._ingest._conn = mock.MagicMock()
+    create_cur = self._ingest._conn.__enter__().cursor().__enter__()
+    statements = list()
+    for product_ids in [[1, 2], ['1', 'A2']]:
+      self._ingest._db_tables = set()
+      df = pd.DataFrame({'site': ['trek'] * 2, 'product_id': product_ids,
+                         'href': ['a', 'b'], 'price': [1.5, None]})
+      self.assertTrue(self._ingest.load_dataframe('munged', df))
+      statements.append(create_cur.execute.call_args[0][0])
+
+    # case 1: same table whatever the product_id dtype
+    self.assertEqual(statements[0], statements[1])
+    for column in ['site TEXT', 'product_id TEXT', 'href TEXT',
+                   'price DOUBLE PRECISION']:
+      self.assertIn(column, statements[0])
+
+    # case 2: schema covers every cleaner field name
+    self.assertEqual(set(Cleaner(self._mediator).get_field_names()),
+                     set(self._ingest._MUNGED_COLUMN_TYPES))
+
 if __name__ == '__main__':
     unittest.main()
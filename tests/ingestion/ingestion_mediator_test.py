@@ -1,4 +1,5 @@
 import unittest
+from unittest import mock
 
 from ingestion.ingestion_mediator import IngestionMediator
 from utils.unit_test_utils import DATA_PATH, MUNGED_DATA_PATH
@@ -32,6 +33,22 @@ class IngestionMediatorTestCase(unittest.TestCase):
         sources = ['nashbar']
         self._mediator._load_to_database(sources=sources, drop_tables=True)
 
+    def test_load_to_database_closes_on_error(self):
+        """Test IngestionMediator._load_to_database() closes connections
+        when loading raises."""
+        self._mediator._ingest_instance = mock.MagicMock()
+        self._mediator._manifest = mock.MagicMock()
+        self._mediator._manifest.get_rows_matching.return_value = [
+            {'site': 'trek', 'tablename': 'products'}]
+
+        for workers, method in [(1, 'load_files'), (2, 'load_file_groups')]:
+            self._mediator._ingest.reset_mock()
+            getattr(self._mediator._ingest, method).side_effect = RuntimeError
+            self.assertRaises(RuntimeError, self._mediator._load_to_database,
+                              sources=['trek'], workers=workers)
+            self._mediator._ingest.close.assert_called_once()
+            self._mediator._manifest.update.assert_not_called()
+
     def test_complete_update(self):
         """Test IngestionMediator.update(from_manifest=False, drop_tables=True).
     
@@ -1,9 +1,31 @@
 import os
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
+from unittest import mock
 from csv import DictReader, DictWriter
 
-from ingestion.manifest import Manifest
+from ingestion.manifest import Manifest, SqliteManifest, SqliteMungedManifest
 from utils.unit_test_utils import DATA_PATH, TEST_DATA_PATH
+from utils.utils import ROOT_PATH, get_recorded_spec_fieldnames
+
+
+def _get_dummy_rows() -> list:
+    """Return manifest rows for every site, tablename, bike_type and
+    timestamp pairing of dummy crawl files."""
+    return [
+        {
+            'site': site, 'tablename': tablename, 'bike_type': bike_type,
+            'filename': f'{site}_{tablename}_{bike_type}_{timestamp}.csv',
+            'timestamp': timestamp, 'loaded': '', 'date_loaded': ''
+        }
+        for site in ['nashbar', 'rei']
+        for tablename in ['products', 'product_specs']
+        for bike_type in ['road', 'mountain']
+        for timestamp in ['01012020', '02012020']
+    ]
 
 
 class ManifestTestCase(unittest.TestCase):
@@ -231,5 +253,246 @@ class ManifestTestCase(unittest.TestCase):
                                 msg=f'{bike_type} not in {result[source].keys()}')
 
 
+class IndexedManifestTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._manifest = Manifest(mediator=None, path=self._tmp_dir.name,
+                                  filename='manifest.csv')
+        self._ROWS = _get_dummy_rows()
+        self._manifest.update(from_list=self._ROWS)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_read_once(self):
+        """Test manifest file is only re-read after it changed on disk."""
+        # case 1: queries served from memory
+        with mock.patch('ingestion.manifest.DictReader') as reader:
+            self.assertEqual(16, len(self._manifest.get_all_rows()))
+            self.assertEqual(8, len(self._manifest.get_product_rows()))
+            self._manifest.get_table_pairs()
+            reader.assert_not_called()
+
+        # case 2: changes written by another manifest are picked up
+        other = Manifest(mediator=None, path=self._tmp_dir.name,
+                         filename='manifest.csv')
+        row = dict(self._ROWS[0], loaded='True')
+        other.update(from_list=[row])
+        result = self._manifest.get_rows_matching(loaded=['True'])
+        self.assertEqual([row], result)
+
+        # case 3: returned rows are copies
+        result[0]['loaded'] = ''
+        self.assertEqual(1, len(self._manifest.get_rows_matching(loaded=['True'])))
+
+    def test_update_to_text(self):
+        """Test updated rows are kept as their csv text values."""
+        row = dict(self._ROWS[0], loaded=False, date_loaded=None)
+        self._manifest.update(from_list=[row])
+        expected = [dict(row, loaded='False', date_loaded='')]
+
+        # case 1: queried in same process right after update
+        self.assertEqual(expected, self._manifest.get_rows_matching(loaded=['False']))
+
+        # case 2: same rows as a fresh manifest reading the file
+        other = Manifest(mediator=None, path=self._tmp_dir.name,
+                         filename='manifest.csv')
+        self.assertEqual(expected, other.get_rows_matching(loaded=['False']))
+
+    def test_get_rows_matching(self):
+        """Test indexed manifest.get_rows_matching() and get_table_pairs()."""
+        # case 1: filter on index and loaded fields
+        result = self._manifest.get_rows_matching(sources=['rei'],
+                                                  tablenames=['products'],
+                                                  bike_types=['road'])
+        self.assertEqual(['01012020', '02012020'],
+                         [row['timestamp'] for row in result])
+
+        # case 2: row moved to another index key
+        row = dict(self._ROWS[0], site='trek')
+        self._manifest.update(from_list=[row])
+        self.assertEqual([row], self._manifest.get_rows_matching(sources=['trek']))
+        self.assertEqual(7, len(self._manifest.get_rows_matching(sources=['nashbar'])))
+
+        # case 3: table pairs use latest file per key
+        pairs = self._manifest.get_table_pairs()
+        self.assertEqual(['nashbar', 'rei', 'trek'], sorted(pairs))
+        self.assertTrue(pairs['rei']['road']['products'].endswith(
+            'rei_products_road_02012020.csv'))
+
+    def test_batch(self):
+        """Test manifest.batch() writes manifest file once."""
+        rows = [dict(row, loaded='True') for row in self._ROWS]
+        with mock.patch.object(self._manifest, '_to_csv',
+                               wraps=self._manifest._to_csv) as to_csv:
+            # case 1: nested batches flush on outermost exit
+            with self._manifest.batch():
+                with self._manifest.batch():
+                    for row in rows:
+                        self._manifest.update(from_list=[row])
+                self.assertEqual(16, len(self._manifest.get_rows_matching(
+                    loaded=['True'])))
+                to_csv.assert_not_called()
+            to_csv.assert_called_once()
+
+        # case 2: flushed rows on disk
+        with open(os.path.join(self._tmp_dir.name, 'manifest.csv')) as f:
+            self.assertEqual(rows, list(DictReader(f)))
+
+    def test_get_unique_spec_fieldnames(self):
+        """Test manifest.get_unique_spec_fieldnames() reads spec files only
+        when missing from the spec fieldnames index."""
+        specs_rows = self._manifest.get_specs_rows()
+        for i, row in enumerate(specs_rows):
+            filepath = self._manifest.get_filepath_for_row(row)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, mode='w') as f:
+                f.write(f'site,product_id,field_{i}\n')
+        expected = {f'field_{i}' for i in range(len(specs_rows))}
+
+        # case 1: headers read once and indexed
+        self.assertEqual(expected, self._manifest.get_unique_spec_fieldnames())
+        self.assertEqual(len(specs_rows),
+                         len(get_recorded_spec_fieldnames(self._tmp_dir.name)))
+
+        # case 2: indexed headers used without opening spec files
+        with mock.patch('ingestion.manifest.get_fieldnames_from_file') as read:
+            self.assertEqual(expected, self._manifest.get_unique_spec_fieldnames())
+            read.assert_not_called()
+
+    def test_concurrent_updates(self):
+        """Test updates from separate manifests and processes are merged."""
+        # case 1: pending rows merged into rows written by another manifest
+        other = Manifest(mediator=None, path=self._tmp_dir.name,
+                         filename='manifest.csv')
+        other.get_all_rows()
+        row1 = dict(self._ROWS[0], loaded='True')
+        row2 = dict(self._ROWS[1], loaded='True')
+        with other.batch():
+            other.update(from_list=[row2])
+            self._manifest.update(from_list=[row1])
+        result = Manifest(mediator=None, path=self._tmp_dir.name,
+                          filename='manifest.csv').get_rows_matching(loaded=['True'])
+        self.assertEqual([row1, row2], result)
+
+        # case 2: parallel processes
+        code = ('import sys\n'
+                'from ingestion.manifest import Manifest\n'
+                'manifest = Manifest(None, path=sys.argv[1], filename="manifest.csv")\n'
+                'for i in range(20):\n'
+                '    manifest.update(from_list=[{"site": sys.argv[2], '
+                '"tablename": "products", "bike_type": "road", '
+                '"filename": f"{sys.argv[2]}_{i}.csv", "timestamp": "01012020", '
+                '"loaded": "", "date_loaded": ""}])\n')
+        processes = [subprocess.Popen([sys.executable, '-c', code,
+                                       self._tmp_dir.name, site],
+                                      cwd=ROOT_PATH)
+                     for site in ['a', 'b', 'c', 'd']]
+        for process in processes:
+            self.assertEqual(0, process.wait())
+        self.assertEqual(16 + 80, len(self._manifest.get_all_rows()))
+
+    def test_failed_write(self):
+        """Test failed write leaves manifest file untouched."""
+        path = os.path.join(self._tmp_dir.name, 'manifest.csv')
+        with open(path) as f:
+            expected = f.read()
+
+        with mock.patch('ingestion.manifest.DictWriter.writerow',
+                        side_effect=OSError('disk full')):
+            self.assertRaises(OSError, self._manifest.update,
+                              from_list=[dict(self._ROWS[0], loaded='True')])
+
+        with open(path) as f:
+            self.assertEqual(expected, f.read())
+        self.assertEqual(['manifest.csv', 'manifest.csv.lock'],
+                         sorted(os.listdir(self._tmp_dir.name)))
+
+
+class SqliteManifestTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._manifest = SqliteManifest(mediator=None, path=self._tmp_dir.name,
+                                        filename='manifest.csv')
+        self._ROWS = _get_dummy_rows()
+        self._manifest.update(from_list=self._ROWS)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_update(self):
+        """Test SqliteManifest.update() upserts rows by filename."""
+        # case 1: rows stored in database file
+        self.assertTrue(os.path.exists(
+            os.path.join(self._tmp_dir.name, 'manifest.db')))
+        self.assertEqual(self._ROWS, self._manifest.get_all_rows())
+
+        # case 2: existing row updated in place, values stored as text
+        row = dict(self._ROWS[0], loaded=True, date_loaded=None)
+        self.assertTrue(self._manifest.update(from_list=[row]))
+        result = self._manifest.get_all_rows()
+        self.assertEqual(16, len(result))
+        self.assertEqual(dict(row, loaded='True', date_loaded=''), result[0])
+
+        # case 3: invalid rows and overwrite
+        self.assertRaises(ValueError, self._manifest.update,
+                          from_list=[{'site': 'rei'}])
+        self.assertRaises(SyntaxError, self._manifest.update, from_data=True,
+                          from_list=self._ROWS)
+        self.assertFalse(self._manifest.update(overwrite=True))
+        self.assertEqual([], self._manifest.get_all_rows())
+
+    def test_get_rows_matching(self):
+        """Test SqliteManifest.get_rows_matching() and get_table_pairs()."""
+        # case 1: filter on indexed fields
+        result = self._manifest.get_rows_matching(sources=['rei'],
+                                                  tablenames=['products'],
+                                                  bike_types=['road', 'gravel'])
+        self.assertEqual(['01012020', '02012020'],
+                         [row['timestamp'] for row in result])
+        self.assertEqual(8, len(self._manifest.get_specs_rows()))
+
+        # case 2: loaded
+        self._manifest.update(from_list=[dict(self._ROWS[3], loaded='True')])
+        result = self._manifest.get_rows_matching(loaded=['True'])
+        self.assertEqual([self._ROWS[3]['filename']],
+                         [row['filename'] for row in result])
+
+        # case 3: table pairs use latest file per key
+        pairs = self._manifest.get_table_pairs()
+        self.assertEqual(['nashbar', 'rei'], sorted(pairs))
+        self.assertEqual(
+            os.path.join(self._tmp_dir.name, '02012020',
+                         'rei_products_road_02012020.csv'),
+            pairs['rei']['road']['products'])
+
+    def test_concurrent_update(self):
+        """Test rows updated from many threads and batches are all kept."""
+        rows = [dict(row, loaded='True') for row in self._ROWS]
+
+        def update(batch):
+            with self._manifest.batch():
+                for row in batch:
+                    self._manifest.update(from_list=[row])
+
+        threads = [threading.Thread(target=update, args=(rows[i::4],))
+                   for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(16, len(self._manifest.get_rows_matching(loaded=['True'])))
+
+    def test_munged_manifest(self):
+        """Test SqliteMungedManifest uses munged manifest fieldnames."""
+        manifest = SqliteMungedManifest(mediator=None, path=self._tmp_dir.name)
+        row = {'site': 'rei', 'tablename': 'products',
+               'filename': 'rei_munged.csv', 'timestamp': '01012020',
+               'loaded': '', 'date_loaded': ''}
+        self.assertTrue(manifest.update(from_list=[row]))
+        self.assertEqual([row], manifest.get_rows_matching(sources=['rei']))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -6,7 +6,7 @@ from bs4 import BeautifulSoup
 
 # package modules
 from scrapers.backcountry import BackCountry
-from utils.unit_test_utils import DATA_PATH, TIMESTAMP
+from utils.unit_test_utils import DATA_PATH, TIMESTAMP, read_fixture
 
 
 class BackcountryTestCase(unittest.TestCase):
@@ -88,6 +88,33 @@ class BackcountryTestCase(unittest.TestCase):
             self.assertTrue(field in self._scraper._specs_fieldnames,
                             msg=f'{field} not in {self._scraper._specs_fieldnames}.')
 
+    def test_page_regions(self):
+        """Test parsers get the same data from page regions as from the
+        whole page."""
+        # case 1: spec page
+        html = read_fixture('backcountry_spec.html')
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertIsNone(soup.find('footer'), msg='Should parse regions only.')
+        result = self._scraper._parse_prod_specs(soup)
+        self.assertEqual(self._scraper._parse_prod_specs(
+            BeautifulSoup(html, 'lxml')), result)
+        self.assertEqual('Fox 32 Step-Cast AX', result['fork'])
+
+        # case 2: listing page
+        html = read_fixture('backcountry_listing.html')
+        results = list()
+        for soup in [BeautifulSoup(html, 'lxml'),
+                     self._scraper._get_soup(html, page_kind='listing')]:
+            self._scraper._products = dict()
+            self._scraper._get_prods_on_current_listings_page(
+                soup, self._bike_type, 'gravel_bikes')
+            results.append((self._scraper._products,
+                            self._scraper._get_next_page(soup)))
+        self.assertIsNone(soup.find('footer'), msg='Should parse regions only.')
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(2, len(results[1][0]))
+        self.assertEqual((True, '/road-bikes?page=2'), results[1][1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,13 +2,14 @@
 import os
 import unittest
 import json
+from unittest import mock
 from pprint import pprint
 
 from bs4 import BeautifulSoup
 
 # package modules
 from scrapers.litespeed import LiteSpeed
-from utils.unit_test_utils import DATA_PATH, TIMESTAMP
+from utils.unit_test_utils import DATA_PATH, TIMESTAMP, read_fixture
 
 
 class SpecializedTestCase(unittest.TestCase):
@@ -74,6 +75,35 @@ class SpecializedTestCase(unittest.TestCase):
             self.assertTrue(field in self._scraper._specs_fieldnames,
                             msg=f'{field} not in {self._scraper._specs_fieldnames}.')
 
+    def test_page_regions(self):
+        """Test parsers get the same data from page regions as from the
+        whole page."""
+        # case 1: spec page
+        html = read_fixture('litespeed_spec.html')
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertIsNone(soup.find('footer'), msg='Should parse regions only.')
+        with mock.patch.object(self._scraper, '_fetch_prod_options',
+                               return_value={'name': 'ultimate', 'options': {}}):
+            result = self._scraper._parse_prod_specs(soup)
+            self.assertEqual(self._scraper._parse_prod_specs(
+                BeautifulSoup(html, 'lxml')), result)
+        self.assertEqual(['Ultegra Build', 'Dura-Ace Build'],
+                         [specs['bike_subtype'] for specs in result])
+        self.assertEqual('Litespeed C1 Carbon', result[0]['fork'])
+
+        # case 2: listing page
+        html = read_fixture('litespeed_listing.html')
+        results = list()
+        for soup in [BeautifulSoup(html, 'lxml'),
+                     self._scraper._get_soup(html, page_kind='listing')]:
+            self._scraper._products = dict()
+            self._scraper._get_prods_on_current_listings_page(
+                soup, self._bike_type, 'race_bikes')
+            results.append(self._scraper._products)
+        self.assertIsNone(soup.find('footer'), msg='Should parse regions only.')
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(2, len(results[1]))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,49 @@
+import threading
+import time
+import unittest
+
+from scrapers.rate_limiter import TokenBucket, get_host_limiter
+
+
+class RateLimiterTestCase(unittest.TestCase):
+    def test_acquire(self):
+        """Test TokenBucket.acquire() allows burst and then sustained rate."""
+        bucket = TokenBucket(rate=50, burst=5)
+
+        # case 1: burst requests don't wait
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+
+        # case 2: following requests limited to rate
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+        # case 3: rate <= 0 disables throttling
+        self.assertEqual(0.0, TokenBucket(rate=0).acquire())
+
+    def test_acquire_threads(self):
+        """Test TokenBucket.acquire() shared between threads."""
+        bucket = TokenBucket(rate=100, burst=1)
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_get_host_limiter(self):
+        """Test get_host_limiter() shares bucket per host."""
+        limiter = get_host_limiter('www.rei.com', rate=8, burst=10)
+        self.assertIs(limiter, get_host_limiter('www.rei.com', rate=1, burst=1))
+        self.assertEqual(8, limiter.get_rate())
+        self.assertIsNot(limiter, get_host_limiter('www.wiggle.com', rate=8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+# python modules
+import subprocess
+import sys
+import unittest
+
+# package modules
+from scrapers.registry import SCRAPERS, get_scraper_class
+from scrapers.scraper import Scraper
+from utils.utils import ROOT_PATH, SOURCES
+
+
+class RegistryTestCase(unittest.TestCase):
+    def test_get_scraper_class(self):
+        """Test get_scraper_class() for every source."""
+        # case 1: all sources registered
+        self.assertEqual(sorted(SOURCES), sorted(SCRAPERS))
+        for source in SOURCES:
+            self.assertTrue(issubclass(get_scraper_class(source), Scraper))
+
+        # case 2: invalid source
+        self.assertRaises(ValueError, get_scraper_class, 'hello world')
+
+    def test_lazy_import(self):
+        """Test only the requested source's scraper module is imported."""
+        code = ('import sys\n'
+                'from ingestion.collect import Collect\n'
+                'from scrapers.registry import get_scraper_class\n'
+                'get_scraper_class("trek")\n'
+                'print(",".join(sorted(m for m in sys.modules if m in {%s})))'
+                % ', '.join(repr(module) for module, _ in SCRAPERS.values()))
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT_PATH,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual('scrapers.trek', result.stdout.strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
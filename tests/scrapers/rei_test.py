@@ -3,9 +3,11 @@ import json
 import os
 import unittest
 
+from bs4 import BeautifulSoup
+
 # package modules
 from scrapers.rei import Rei
-from utils.unit_test_utils import DATA_PATH, TIMESTAMP
+from utils.unit_test_utils import DATA_PATH, TIMESTAMP, read_fixture
 
 
 class ReiTestCase(unittest.TestCase):
@@ -76,6 +78,45 @@ class ReiTestCase(unittest.TestCase):
             self.assertTrue(field in self._scraper._specs_fieldnames,
                             msg=f'{field} not in {self._scraper._specs_fieldnames}.')
 
+    def test_parse_spec_page(self):
+        """Test Rei._parse_spec_page() for json embedded in script blocks."""
+        data = {'specs': [{'name': 'Frame', 'values': ['Aluminum']}],
+                'features': ['Light', 'Fast']}
+        html = ('<html><head><script src="app.js"></script>'
+                '<script type="application/json" '
+                f'data-client-store="product-details">{json.dumps(data)}'
+                '</script></head><body></body></html>')
+        self._scraper._products = {'1': {'product_id': '1', 'href': '/p/1'}}
+
+        # case 1: json extracted from raw page text
+        expected = {'details': 'Light\nFast', 'frame': 'Aluminum'}
+        self.assertEqual(expected, self._scraper._parse_spec_page('1', html))
+
+        # case 2: garage product json data nested under product
+        garage_data = {'product': {'specifications': data,
+                                   'features': data['features']}}
+        garage_html = (f'<script id="page-data">{json.dumps(garage_data)}'
+                       '</script>')
+        self._scraper._products['2'] = {'product_id': '2',
+                                        'href': '/rei-garage/product/2'}
+        self.assertEqual(expected,
+                         self._scraper._parse_spec_page('2', garage_html))
+
+    def test_page_regions(self):
+        """Test parser gets the same data from page regions as from the
+        whole page."""
+        for filename, garage in [('rei_spec.html', False),
+                                 ('rei_garage_spec.html', True)]:
+            html = read_fixture(filename)
+            soup = self._scraper._get_soup(html, page_kind='spec')
+            self.assertIsNone(soup.find('footer'),
+                              msg='Should parse regions only.')
+            result = self._scraper._parse_prod_specs(soup, garage=garage)
+            self.assertEqual(self._scraper._parse_prod_specs(
+                BeautifulSoup(html, 'lxml'), garage=garage), result)
+            self.assertEqual('Suntour NEX, 63mm travel', result['fork'])
+            self.assertTrue(result['details'].startswith('Aluminum frame & fork'))
+
 
 if __name__ == '__main__':
     unittest.main()
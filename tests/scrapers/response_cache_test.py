@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+import unittest
+
+from scrapers.response_cache import ResponseCache
+
+
+class ResponseCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._cache = ResponseCache(path=self._tmp_dir.name,
+                                    ttls={'listing': 60, 'spec': 0},
+                                    max_size=13000)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_get_key(self):
+        """Test ResponseCache.get_key() depends on url and params."""
+        key = self._cache.get_key('https://www.nashbar.com/bikes',
+                                  params={'page': 1, 'size': 24})
+        self.assertEqual(key, self._cache.get_key('https://www.nashbar.com/bikes',
+                                                  params={'size': 24, 'page': 1}))
+        self.assertNotEqual(key, self._cache.get_key('https://www.nashbar.com/bikes',
+                                                     params={'page': 2, 'size': 24}))
+
+    def test_put_get(self):
+        """Test ResponseCache.put() and ResponseCache.get()."""
+        key = self._cache.get_key('https://www.trekbikes.com/bikes')
+        self.assertIsNone(self._cache.get(key))
+
+        self._cache.put(key, url='https://www.trekbikes.com/bikes',
+                        page_kind='listing', text='<html>bikes</html>')
+        entry = self._cache.get(key)
+        self.assertEqual('<html>bikes</html>', entry['text'])
+
+        # case: freshness depends on page kind ttl
+        self.assertTrue(self._cache.is_fresh(entry, 'listing'))
+        self.assertFalse(self._cache.is_fresh(entry, 'spec'))
+
+    def test_evict(self):
+        """Test ResponseCache.put() evicts least recently used entries."""
+        keys = [self._cache.get_key(f'https://www.rei.com/{i}') for i in range(4)]
+        for i, key in enumerate(keys):
+            self._cache.put(key, url=f'https://www.rei.com/{i}',
+                            page_kind='spec', text='x' * 3000)
+            # ensure distinct last used times
+            past = time.time() - 100 + i
+            os.utime(self._cache._get_entry_path(key), (past, past))
+
+        # mark first entry as recently used then add one more entry
+        self._cache.get(keys[0])
+        key = self._cache.get_key('https://www.rei.com/4')
+        self._cache.put(key, url='https://www.rei.com/4', page_kind='spec',
+                        text='x' * 3000)
+
+        self.assertIsNotNone(self._cache.get(keys[0]))
+        self.assertIsNone(self._cache.get(keys[1]))
+        self.assertIsNotNone(self._cache.get(keys[2]))
+        self.assertIsNotNone(self._cache.get(key))
+        self.assertLessEqual(self._cache._get_disk_size(), 13000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from scrapers.retry import RetryPolicy
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def test_next_delay(self):
+        """Test RetryPolicy.next_delay() backoff and limits."""
+        policy = RetryPolicy(max_retries=3, backoff_factor=1.0,
+                             max_backoff=5.0, retry_budget=10)
+
+        # case 1: jittered exponential backoff
+        for attempt, backoff in enumerate([1.0, 2.0, 4.0]):
+            delay = policy.next_delay(attempt)
+            self.assertTrue(backoff / 2 <= delay <= backoff,
+                            msg=f'attempt {attempt} delay {delay} not in range')
+
+        # case 2: max retries reached
+        self.assertIsNone(policy.next_delay(3))
+
+        # case 3: retry_after honored, unless longer than max_backoff
+        self.assertGreaterEqual(policy.next_delay(0, retry_after=4.5), 4.5)
+        self.assertIsNone(policy.next_delay(0, retry_after=30))
+
+    def test_retry_budget(self):
+        """Test RetryPolicy.next_delay() stops once budget is spent."""
+        policy = RetryPolicy(max_retries=5, backoff_factor=0.0, retry_budget=2)
+        self.assertIsNotNone(policy.next_delay(0))
+        self.assertIsNotNone(policy.next_delay(0))
+        self.assertIsNone(policy.next_delay(0))
+        self.assertEqual(0, policy.get_retry_budget())
+
+    def test_parse_retry_after(self):
+        """Test RetryPolicy.parse_retry_after() for seconds and dates."""
+        self.assertEqual(120.0, RetryPolicy.parse_retry_after('120'))
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+        self.assertIsNone(RetryPolicy.parse_retry_after('soon'))
+
+        retry_date = datetime.now(timezone.utc) + timedelta(seconds=60)
+        seconds = RetryPolicy.parse_retry_after(format_datetime(retry_date, usegmt=True))
+        self.assertTrue(50 < seconds <= 60, msg=f'{seconds} not about 60s')
+
+
+if __name__ == '__main__':
+    unittest.main()
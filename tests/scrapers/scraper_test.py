@@ -0,0 +1,406 @@
+# python modules
+import os
+import tempfile
+import threading
+import time
+import unittest
+from csv import DictReader, DictWriter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# package modules
+from scrapers.response_cache import ResponseCache
+from scrapers.retry import RetryPolicy
+from scrapers.scraper import Scraper
+from utils.unit_test_utils import DATA_PATH
+from utils.utils import get_recorded_spec_fieldnames
+
+
+class SpecPageHandler(BaseHTTPRequestHandler):
+    """Serves a minimal specs page for /bikes/<product_id> paths."""
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    requests = list()
+
+    def do_GET(self):
+        cls = SpecPageHandler
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.requests.append(self.path)
+        time.sleep(0.02)  # simulate network latency
+
+        prod_id = self.path.split('/')[-1]
+        if prod_id == 'missing':
+            self.send_response(404)
+            body = b''
+        elif self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            body = b''
+        elif prod_id.startswith('flaky') and cls.requests.count(self.path) == 1:
+            self.send_response(503)
+            self.send_header('Retry-After', '0')
+            body = b''
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"v1"')
+            body = (f'<html><body><ul class="specs"><li>frame: carbon {prod_id}</li>'
+                    f'<li>fork: alloy</li></ul></body></html>').encode('utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+        with cls.lock:
+            cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class DummyScraper(Scraper):
+    """Scraper for the local test server."""
+    _PAGE_REGIONS = {'spec': [('ul', {'class': 'specs'})]}
+
+    def __init__(self, base_url, save_data_path=DATA_PATH):
+        super().__init__(base_url=base_url, source='dummy',
+                         save_data_path=save_data_path)
+        self.num_parsed = 0
+
+    def _fetch_prod_listing_view(self, **kwargs):
+        pass
+
+    def _get_max_num_prods(self, soup):
+        pass
+
+    def _get_prods_on_current_listings_page(self, **kwargs):
+        pass
+
+    def get_all_available_prods(self, to_csv=True) -> list:
+        """List 4 pages of 5 products, recording spec requests made by the
+        time the last page is done."""
+        self._products = dict()
+        for page in range(4):
+            time.sleep(0.05)  # simulate listing page latency
+            for i in range(page * 5, page * 5 + 5):
+                self._add_product(str(i), {'product_id': str(i),
+                                           'href': f'/bikes/{i}'})
+        self.requests_while_listing = len(SpecPageHandler.requests)
+
+        if to_csv:
+            return [self._write_prod_listings_to_csv()]
+        return list()
+
+    def _parse_prod_specs(self, soup):
+        self.num_parsed += 1
+        prod_specs = dict()
+        for li in soup.find('ul', class_='specs').find_all('li'):
+            spec_name, value = li.string.split(': ')
+            spec_name = self._normalize_spec_fieldnames(spec_name)
+            prod_specs[spec_name] = value
+            self._specs_fieldnames.add(spec_name)
+        return prod_specs
+
+
+class ScraperTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._server = ThreadingHTTPServer(('127.0.0.1', 0), SpecPageHandler)
+        cls._thread = threading.Thread(target=cls._server.serve_forever,
+                                       daemon=True)
+        cls._thread.start()
+        cls._BASE_URL = f'http://127.0.0.1:{cls._server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._server.shutdown()
+        cls._server.server_close()
+
+    def setUp(self):
+        SpecPageHandler.max_in_flight = 0
+        SpecPageHandler.requests = list()
+        self._scraper = DummyScraper(base_url=self._BASE_URL)
+        self._scraper._settings['rate_limit'] = 0  # don't throttle local server
+        self._scraper._products = {
+            str(i): {'product_id': str(i), 'href': f'/bikes/{i}'}
+            for i in range(20)
+        }
+        self._scraper._products['missing'] = {'product_id': 'missing',
+                                              'href': '/bikes/missing'}
+
+    def tearDown(self):
+        self._scraper.close()
+
+    def test_get_product_specs(self):
+        """Test Scraper.get_product_specs() serially and concurrently."""
+        # case 1: one request in flight
+        serial = self._scraper.get_product_specs(get_prods_from='memory',
+                                                 to_csv=False, concurrency=1)
+        self.assertEqual(1, SpecPageHandler.max_in_flight)
+
+        # case 2: concurrent requests return same specs in product order
+        SpecPageHandler.max_in_flight = 0
+        specs = self._scraper.get_product_specs(get_prods_from='memory',
+                                                to_csv=False, concurrency=5)
+        self.assertGreater(SpecPageHandler.max_in_flight, 1)
+        self.assertLessEqual(SpecPageHandler.max_in_flight, 5)
+        self.assertEqual(serial, specs)
+        self.assertEqual(list(self._scraper._products.keys()), list(specs.keys()))
+
+        # case 3: parsed specs with primary keys, missing page is empty
+        self.assertEqual('carbon 3', specs['3']['frame'])
+        self.assertEqual('dummy', specs['3']['site'])
+        self.assertEqual({'product_id': 'missing', 'site': 'dummy'},
+                         specs['missing'])
+        self.assertTrue('fork' in self._scraper._specs_fieldnames)
+
+    def test_get_product_specs_parse_workers(self):
+        """Test Scraper.get_product_specs() parsing in worker processes."""
+        serial = self._scraper.get_product_specs(get_prods_from='memory',
+                                                 to_csv=False, concurrency=4)
+        self._scraper._settings['parse_workers'] = 2
+        self._scraper._specs_fieldnames = {'site', 'product_id', 'details'}
+        self._scraper.num_parsed = 0
+
+        specs = self._scraper.get_product_specs(get_prods_from='memory',
+                                                to_csv=False, concurrency=4)
+        self.assertEqual(serial, specs)
+        self.assertEqual(0, self._scraper.num_parsed)  # parsed by workers
+        self.assertTrue('fork' in self._scraper._specs_fieldnames)
+
+    def test_get_product_specs_incremental(self):
+        """Test Scraper.get_product_specs(previous=...) fetches only new or
+        changed products."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            prods_path = os.path.join(tmp_dir, 'dummy_prods_all.csv')
+            specs_path = os.path.join(tmp_dir, 'dummy_specs_all.csv')
+            with open(prods_path, mode='w', newline='', encoding='utf-8') as f:
+                writer = DictWriter(f, fieldnames=['product_id', 'href', 'price'])
+                writer.writeheader()
+                writer.writerow({'product_id': '1', 'href': '/bikes/1', 'price': ''})
+                writer.writerow({'product_id': '2', 'href': '/bikes/old2', 'price': ''})
+                writer.writerow({'product_id': '3', 'href': '/bikes/3', 'price': ''})
+            with open(specs_path, mode='w', newline='', encoding='utf-8') as f:
+                writer = DictWriter(f, fieldnames=['site', 'product_id', 'frame',
+                                                   'saddle'])
+                writer.writeheader()
+                writer.writerow({'site': 'dummy', 'product_id': '1',
+                                 'frame': 'steel', 'saddle': 'leather'})
+                writer.writerow({'site': 'dummy', 'product_id': '2',
+                                 'frame': 'steel'})
+                writer.writerow({'site': 'dummy', 'product_id': '3'})
+
+            specs = self._scraper.get_product_specs(
+                get_prods_from='memory', to_csv=False,
+                previous={'products': prods_path, 'product_specs': specs_path})
+
+        # case 1: unchanged product carried over
+        self.assertEqual(0, SpecPageHandler.requests.count('/bikes/1'))
+        self.assertEqual('steel', specs['1']['frame'])
+        self.assertTrue('saddle' in self._scraper._specs_fieldnames)
+
+        # case 2: changed href, missing specs and new products fetched
+        self.assertEqual('carbon 2', specs['2']['frame'])
+        self.assertEqual('carbon 3', specs['3']['frame'])
+        self.assertEqual('carbon 4', specs['4']['frame'])
+        self.assertEqual(len(self._scraper._products) - 1,
+                         len(SpecPageHandler.requests))
+        self.assertEqual(list(self._scraper._products.keys()), list(specs.keys()))
+
+    def test_get_product_specs_resume(self):
+        """Test Scraper.get_product_specs(resume=True) skips products captured
+        in checkpoint of an interrupted crawl."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._scraper._DATA_PATH = tmp_dir
+            checkpoint = self._scraper._get_checkpoint('all')
+            checkpoint.clear()
+            for bike in ['1', '2']:
+                checkpoint.append(bike, {'product_id': bike, 'site': 'dummy',
+                                         'frame': 'steel'})
+            with open(checkpoint.get_path(), mode='a') as f:  # torn last line
+                f.write('{"bike": "3", "spe')
+
+            row = self._scraper.get_product_specs(get_prods_from='memory',
+                                                  resume=True)
+            with open(os.path.join(tmp_dir, self._scraper._TIMESTAMP,
+                                   row['filename']), encoding='utf-8') as f:
+                rows = {r['product_id']: r for r in DictReader(f)}
+
+            # case 1: captured products not fetched again
+            self.assertEqual(0, SpecPageHandler.requests.count('/bikes/1'))
+            self.assertEqual(len(self._scraper._products) - 2,
+                             len(SpecPageHandler.requests))
+
+            # case 2: csv has captured and fetched specs, including the first
+            # fetched after the torn line
+            self.assertEqual(len(self._scraper._products), len(rows))
+            self.assertEqual('steel', rows['1']['frame'])
+            self.assertEqual('carbon 3', rows['3']['frame'])
+
+            # case 3: checkpoint removed once csv saved
+            self.assertFalse(os.path.exists(checkpoint.get_path()))
+
+            # case 4: csv header recorded in spec fieldnames index
+            recorded = get_recorded_spec_fieldnames(tmp_dir)
+            self.assertEqual(
+                list(rows['1'].keys()),
+                recorded[os.path.join(self._scraper._TIMESTAMP, row['filename'])])
+
+    def test_get_all_available_prods_and_specs(self):
+        """Test Scraper.get_all_available_prods_and_specs() fetches specs
+        while listing pages are crawled."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._scraper._DATA_PATH = tmp_dir
+            rows = self._scraper.get_all_available_prods_and_specs(
+                concurrency=4)
+            with open(os.path.join(tmp_dir, self._scraper._TIMESTAMP,
+                                   rows[1]['filename']), encoding='utf-8') as f:
+                specs = {r['product_id']: r for r in DictReader(f)}
+
+            # case 1: listing and spec crawls overlap
+            self.assertGreater(self._scraper.requests_while_listing, 0)
+
+            # case 2: products and specs manifest rows, specs for all products
+            self.assertEqual(['products', 'product_specs'],
+                             [row['tablename'] for row in rows])
+            self.assertEqual(20, len(specs))
+            self.assertEqual(20, len(SpecPageHandler.requests))
+            self.assertEqual('carbon 7', specs['7']['frame'])
+
+    def test_get_soup(self):
+        """Test Scraper._get_soup() parses only declared page regions."""
+        html = ('<html><head><script>var x = 1;</script></head><body>'
+                '<div id="intro"><p>hi</p><ul class="main specs"><li>a</li>'
+                '</ul></div><ul class="specs"><li>b</li></ul>'
+                '<ul><li>c</li></ul></body></html>')
+
+        # case 1: only regions parsed, nested regions kept once
+        self._scraper._PAGE_REGIONS = {
+            'spec': [('ul', {'class': 'specs'}), (None, {'id': 'intro'})]}
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertIsNone(soup.find('script'))
+        self.assertEqual(['a', 'b'], [li.string for li in soup.find_all('li')])
+        self.assertEqual('hi', soup.find(id='intro').p.string)
+
+        # case 2: whole page if no regions declared for page kind
+        soup = self._scraper._get_soup(html, page_kind='listing')
+        self.assertEqual(3, len(soup.find_all('li')))
+
+        # case 3: whole page if no region found
+        self._scraper._PAGE_REGIONS = {'spec': [('table', {'id': 'specs'})]}
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertIsNotNone(soup.find('script'))
+
+        # case 4: whole page if any region not found
+        self._scraper._PAGE_REGIONS = {
+            'spec': [(None, {'id': 'intro'}), ('table', {'id': 'specs'})]}
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertEqual(3, len(soup.find_all('li')))
+
+        # case 5: region found by any of its alternatives
+        self._scraper._PAGE_REGIONS = {
+            'spec': [(None, {'id': 'intro'}),
+                     [('table', {'id': 'specs'}), ('ul', {'class': 'specs'})]]}
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertIsNone(soup.find('script'))
+        self.assertEqual(['a', 'b'], [li.string for li in soup.find_all('li')])
+
+        # case 6: url attributes kept as on page
+        html = ('<div id="intro"><a href=" /bikes/vélo 1 " name="a b">v</a>'
+                '<img src="/img/a b.png"><a href="/bikes/2?a=1&amp;b=2">2</a>'
+                '</div>')
+        soup = self._scraper._get_soup(html, page_kind='spec')
+        self.assertEqual([' /bikes/vélo 1 ', '/bikes/2?a=1&b=2'],
+                         [a['href'] for a in soup.find_all('a')])
+        self.assertEqual('a b', soup.a['name'])
+        self.assertEqual('/img/a b.png', soup.img['src'])
+        self.assertIsNone(soup.find(attrs={'data-raw-href': True}))
+
+    def test_extract_script_json(self):
+        """Test Scraper._extract_script_json() finds json by script attrs."""
+        html = ('<script src="app.js"></script>'
+                '<script type="application/json" id="data">[1, 2]</script>'
+                "<SCRIPT data-store='product' >{\"a\": \"</b>\"}</script >"
+                '<script id="broken">{</script>')
+
+        # case 1: matching block, case and quotes ignored
+        self.assertEqual([1, 2],
+                         self._scraper._extract_script_json(html, {'id': 'data'}))
+        self.assertEqual({'a': '</b>'}, self._scraper._extract_script_json(
+            html, {'data-store': 'product'}))
+
+        # case 2: missing block or invalid json
+        self.assertIsNone(self._scraper._extract_script_json(html, {'id': 'x'}))
+        self.assertIsNone(self._scraper._extract_script_json(html,
+                                                             {'id': 'broken'}))
+
+    def test_fetch_html_retry(self):
+        """Test Scraper._fetch_html() retries unavailable responses."""
+        self._scraper._retry_policy = RetryPolicy(max_retries=2,
+                                                  backoff_factor=0.01,
+                                                  retry_budget=1)
+
+        # case 1: 503 is retried
+        html = self._scraper._fetch_html(url=f'{self._BASE_URL}/bikes/flaky1')
+        self.assertTrue('carbon flaky1' in html)
+        self.assertEqual(2, SpecPageHandler.requests.count('/bikes/flaky1'))
+
+        # case 2: retry budget spent
+        self.assertRaises(FileNotFoundError, self._scraper._fetch_html,
+                          url=f'{self._BASE_URL}/bikes/flaky2')
+
+        # case 3: 404 not retried
+        self.assertRaises(FileNotFoundError, self._scraper._fetch_html,
+                          url=f'{self._BASE_URL}/bikes/missing')
+        self.assertEqual(1, SpecPageHandler.requests.count('/bikes/missing'))
+
+    def test_fetch_html_cache(self):
+        """Test Scraper._fetch_html() serves fresh pages from cache."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._scraper._response_cache = ResponseCache(
+                path=tmp_dir, ttls={'listing': 0, 'spec': 60}, max_size=10000)
+
+            # case 1: spec page fetched once
+            specs = self._scraper.get_product_specs(get_prods_from='memory',
+                                                    to_csv=False)
+            cached = self._scraper.get_product_specs(get_prods_from='memory',
+                                                     to_csv=False)
+            self.assertEqual(specs, cached)
+            self.assertEqual(1, SpecPageHandler.requests.count('/bikes/3'))
+
+            # case 2: stale listing page fetched again
+            url = f'{self._BASE_URL}/bikes/listing'
+            self._scraper._fetch_html(url)
+            self._scraper._fetch_html(url)
+            self.assertEqual(2, SpecPageHandler.requests.count('/bikes/listing'))
+
+    def test_fetch_page_not_modified(self):
+        """Test Scraper._fetch_page() revalidates stale pages."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._scraper._response_cache = ResponseCache(
+                path=tmp_dir, ttls={'listing': 0, 'spec': 0}, max_size=100000)
+
+            # case 1: first crawl fetches and parses every spec page
+            specs = self._scraper.get_product_specs(get_prods_from='memory',
+                                                    to_csv=False)
+            self.assertEqual(20, self._scraper.num_parsed)
+
+            # case 2: 304 responses reuse previously parsed specs
+            self._scraper._specs_fieldnames = {'site', 'product_id', 'details'}
+            revalidated = self._scraper.get_product_specs(get_prods_from='memory',
+                                                          to_csv=False)
+            self.assertEqual(20, self._scraper.num_parsed)
+            self.assertEqual(2, SpecPageHandler.requests.count('/bikes/3'))
+            self.assertEqual(specs, revalidated)
+            self.assertTrue('frame' in self._scraper._specs_fieldnames)
+
+            # case 3: listing page text served from cache on 304
+            url = f'{self._BASE_URL}/bikes/listing'
+            page = self._scraper._fetch_page(url)
+            self.assertEqual('fetched', page.status)
+            page = self._scraper._fetch_page(url)
+            self.assertEqual('not_modified', page.status)
+            self.assertTrue('carbon listing' in page.text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from scrapers.session_pool import SessionPool
+
+
+class SessionPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self._pool = SessionPool(pool_size=4, headers={'Connection': 'keep-alive'})
+
+    def tearDown(self):
+        self._pool.close()
+
+    def test_get_session(self):
+        """Test SessionPool.get_session() reuses sessions per host."""
+        # case 1: same host returns same session
+        session1 = self._pool.get_session('https://www.trekbikes.com/us/en_US/')
+        session2 = self._pool.get_session('https://www.trekbikes.com/bikes/c/B100/')
+        self.assertIs(session1, session2,
+                      msg='Requests to same host should share a session.')
+        self.assertEqual('keep-alive', session1.headers['Connection'])
+
+        # case 2: different host returns new session
+        session3 = self._pool.get_session('https://www.wiggle.com/cycle/bikes')
+        self.assertIsNot(session1, session3,
+                         msg='Each host should have its own session.')
+        self.assertEqual(2, len(self._pool.get_hosts()))
+
+        # case 3: adapter sized to pool_size
+        adapter = session1.get_adapter('https://www.trekbikes.com')
+        self.assertEqual(4, adapter._pool_maxsize)
+
+    def test_close(self):
+        """Test SessionPool.close() releases all sessions."""
+        session = self._pool.get_session('https://www.rei.com/c/bikes')
+        self._pool.close()
+        self.assertEqual([], self._pool.get_hosts())
+        self.assertIsNot(session, self._pool.get_session('https://www.rei.com'),
+                         msg='Closed pool should create a new session.')
+
+
+if __name__ == '__main__':
+    unittest.main()
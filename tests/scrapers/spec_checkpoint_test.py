@@ -0,0 +1,72 @@
+# python modules
+import os
+import tempfile
+import unittest
+
+# package modules
+from scrapers.spec_checkpoint import SpecCheckpoint
+
+
+class SpecCheckpointTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self._checkpoint = SpecCheckpoint(
+            os.path.join(self._tmp_dir.name, 'checkpoints', 'dummy.jsonl'))
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def test_iter_specs(self):
+        """Test SpecCheckpoint.iter_specs() yields appended specs."""
+        # case 1: no checkpoint file
+        self.assertEqual([], list(self._checkpoint.iter_specs()))
+
+        # case 2: appended specs in order
+        self._checkpoint.append('1', {'frame': 'carbon'})
+        self._checkpoint.append('2', {'frame': 'steel'})
+        self.assertEqual([('1', {'frame': 'carbon'}), ('2', {'frame': 'steel'})],
+                         list(self._checkpoint.iter_specs()))
+
+        # case 3: line left incomplete by interrupted write skipped
+        with open(self._checkpoint.get_path(), mode='a') as f:
+            f.write('{"bike": "3", "spe')
+        self.assertEqual(2, len(list(self._checkpoint.iter_specs())))
+
+    def test_truncate_incomplete(self):
+        """Test SpecCheckpoint.truncate_incomplete() before appending."""
+        # case 1: no checkpoint file
+        self._checkpoint.truncate_incomplete()
+        self.assertFalse(os.path.exists(self._checkpoint.get_path()))
+
+        # case 2: specs appended after torn last line kept
+        self._checkpoint.append('a', {'frame': 'carbon'})
+        with open(self._checkpoint.get_path(), mode='a') as f:
+            f.write('{"bike": "b", "spe')
+        self._checkpoint.truncate_incomplete()
+        self._checkpoint.append('c', {'frame': 'steel'})
+        self.assertEqual(['a', 'c'],
+                         [bike for bike, _ in self._checkpoint.iter_specs()])
+
+        # case 3: complete lines untouched
+        self._checkpoint.truncate_incomplete()
+        self.assertEqual(2, len(list(self._checkpoint.iter_specs())))
+
+        # case 4: torn only line truncated to empty file
+        self._checkpoint.clear()
+        with open(self._checkpoint.get_path(), mode='a') as f:
+            f.write('{"bike": "b", "spe')
+        self._checkpoint.truncate_incomplete()
+        self.assertEqual(0, os.path.getsize(self._checkpoint.get_path()))
+
+    def test_clear_and_remove(self):
+        """Test SpecCheckpoint.clear() and remove()."""
+        self._checkpoint.append('1', {'frame': 'carbon'})
+        self._checkpoint.clear()
+        self.assertEqual([], list(self._checkpoint.iter_specs()))
+
+        self._checkpoint.remove()
+        self.assertFalse(os.path.exists(self._checkpoint.get_path()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ from bs4 import BeautifulSoup
 
 # package modules
 from scrapers.trek import Trek
-from utils.unit_test_utils import DATA_PATH, TIMESTAMP
+from utils.unit_test_utils import DATA_PATH, TIMESTAMP, read_fixture
 
 
 class SpecializedTestCase(unittest.TestCase):
@@ -78,6 +78,46 @@ class SpecializedTestCase(unittest.TestCase):
             self.assertTrue(field in self._scraper._specs_fieldnames,
                             msg=f'{field} not in {self._scraper._specs_fieldnames}.')
 
+    def test_page_regions(self):
+        """Test parsers get the same data from page regions as from the
+        whole page."""
+        # case 1: spec pages of either specs layout
+        for filename, value in [
+                ('trek_spec.html', 'Domane SL full carbon, tapered carbon steerer'),
+                ('trek_bom_spec.html', 'FX Carbon_Flat mount disc, 405mm axle-to-crown')]:
+            html = read_fixture(filename)
+            soup = self._scraper._get_soup(html, page_kind='spec')
+            self.assertIsNone(soup.find('footer'),
+                              msg='Should parse regions only.')
+            result = self._scraper._parse_prod_specs(soup)
+            self.assertEqual(self._scraper._parse_prod_specs(
+                BeautifulSoup(html, 'lxml')), result)
+            self.assertEqual(value, result['fork'])
+
+        # case 2: categories
+        html = read_fixture('trek_listing.html')
+        soup = self._scraper._get_soup(html, page_kind='categories')
+        self.assertIsNone(soup.find('footer'), msg='Should parse regions only.')
+        result = self._scraper._parse_categories(soup, ['kids_bikes'])
+        self.assertEqual(self._scraper._parse_categories(
+            BeautifulSoup(html, 'lxml'), ['kids_bikes']), result)
+        self.assertEqual(['road_bikes', 'mountain_bikes'], list(result))
+
+        # case 3: listing page
+        results = list()
+        for soup in [BeautifulSoup(html, 'lxml'),
+                     self._scraper._get_soup(html, page_kind='listing')]:
+            self._scraper._products = dict()
+            self._scraper._get_prods_on_current_listings_page(
+                soup, self._bike_type, 'race_bikes')
+            results.append((self._scraper._products,
+                            self._scraper._next_page(soup)))
+        self.assertIsNone(soup.find('footer'), msg='Should parse regions only.')
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(2, len(results[1][0]))
+        self.assertEqual((True, '/us/en_US/bikes/road-bikes/c/B200/?page=1'),
+                         results[1][1])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,10 @@
+import os
+import tempfile
 import unittest
 
-from scrapers.scraper_utils import get_bike_type_from_desc
+from utils.utils import get_bike_type_from_desc, scraper_settings
+from utils.utils import get_recorded_spec_fieldnames, record_spec_fieldnames
+from utils.utils import SCRAPER_SETTINGS, SPEC_FIELDNAMES_FILENAME
 
 
 class UtilsTestCase(unittest.TestCase):
@@ -93,6 +97,37 @@ class UtilsTestCase(unittest.TestCase):
                 self.assertEqual(result, bike_type,
                                  msg=f'Failed to match "{desc}"')
 
+    def test_record_spec_fieldnames(self):
+        """Test case for the spec fieldnames index."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = os.path.join(tmp_dir, '01012020', 'rei_specs_all.csv')
+
+            # case 1: missing index
+            self.assertEqual({}, get_recorded_spec_fieldnames(tmp_dir))
+
+            # case 2: latest record per file wins, invalid lines skipped
+            record_spec_fieldnames(tmp_dir, filepath, ['site', 'frame'])
+            with open(os.path.join(tmp_dir, SPEC_FIELDNAMES_FILENAME), 'a') as f:
+                f.write('{"filepath": "01012020/tre\n')
+            record_spec_fieldnames(tmp_dir, filepath, ['site', 'fork'])
+            self.assertEqual({os.path.join('01012020', 'rei_specs_all.csv'):
+                              ['site', 'fork']},
+                             get_recorded_spec_fieldnames(tmp_dir))
+
+    def test_scraper_settings(self):
+        """Test case for reading per source scraper settings."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filename = os.path.join(tmp_dir, 'config.ini')
+
+            # case 1: missing config file returns defaults
+            self.assertEqual(SCRAPER_SETTINGS, scraper_settings('trek', filename))
+
+            # case 2: source section overrides general section
+            with open(filename, mode='w') as f:
+                f.write('[scraper]\npool_size=5\n\n[scraper_wiggle]\npool_size=20\n')
+            self.assertEqual(5, scraper_settings('trek', filename)['pool_size'])
+            self.assertEqual(20, scraper_settings('wiggle', filename)['pool_size'])
+
 
 if __name__ == '__main__':
     unittest.main()
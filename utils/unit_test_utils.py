@@ -7,3 +7,10 @@ TESTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir,
 DATA_PATH = os.path.abspath(os.path.join(TESTS_DIR, 'data'))
 TEST_DATA_PATH = os.path.abspath(os.path.join(TESTS_DIR, 'test_data'))
 MUNGED_DATA_PATH = os.path.abspath(os.path.join(TESTS_DIR, 'munged_data'))
+FIXTURES_PATH = os.path.abspath(os.path.join(TESTS_DIR, 'scrapers', 'fixtures'))
+
+
+def read_fixture(filename: str) -> str:
+    """Return html of saved page fixture."""
+    with open(os.path.join(FIXTURES_PATH, filename), encoding='utf-8') as f:
+        return f.read()
@@ -1,3 +1,4 @@
+import json
 import os
 import re
 from datetime import datetime
@@ -11,6 +12,7 @@ MUNGED_DATA_PATH = os.path.join(DATA_PATH, 'munged_data')
 COMBINED_MUNGED_PATH = os.path.join(MUNGED_DATA_PATH, 'combined')
 TIMESTAMP = datetime.now().strftime('%m%d%Y')
 CONFIG_FILE = os.path.join(ROOT_PATH, 'config.ini')
+SPEC_FIELDNAMES_FILENAME = 'spec_fieldnames.jsonl'  # headers of spec files
 SOURCES = [
     'backcountry', 'bicycle_warehouse', 'bike_doctor', 'canyon', 'citybikes',
     'competitive', 'contebikes', 'eriks', 'giant',
@@ -20,6 +22,22 @@ SOURCES = [
 SOURCES_EXCLUDE = [
     'foxvalley'
 ]
+SCRAPER_SETTINGS = {  # defaults, override in [scraper] or [scraper_<source>]
+    'pool_size': 10,
+    'concurrency': 1,  # spec requests in flight per host
+    'parse_workers': 0,  # processes parsing spec pages, 0 parses in crawl
+    'rate_limit': 5.0,  # sustained requests per second per host
+    'burst': 5,  # requests allowed at once before rate_limit applies
+    'timeout': 30.0,  # seconds to wait for a response
+    'max_retries': 3,  # retries per request
+    'backoff_factor': 1.0,  # seconds, doubled every retry
+    'max_backoff': 60.0,  # longest wait between retries, incl. Retry-After
+    'retry_budget': 100,  # retries allowed per crawl
+    'cache': False,  # cache fetched pages under the raw data path
+    'cache_listing_ttl': 21600.0,  # seconds listing pages stay fresh
+    'cache_spec_ttl': 604800.0,  # seconds spec pages stay fresh
+    'cache_max_mb': 2048  # evict least recently used pages past this size
+}
 GROUPSET_RANKING = {
     'shimano claris': 1,
     'shimano sora': 2,
@@ -126,6 +144,38 @@ def get_fieldnames_from_file(filepath: str) -> list:
     return fieldnames
 
 
+def record_spec_fieldnames(data_path: str, filepath: str, fieldnames):
+    """Append header of spec file at filepath to the spec fieldnames index
+    in data_path, keyed by filepath relative to data_path."""
+    line = json.dumps({'filepath': os.path.relpath(filepath, data_path),
+                       'fieldnames': list(fieldnames)}) + '\n'
+    index_path = os.path.join(data_path, SPEC_FIELDNAMES_FILENAME)
+    create_directory_if_missing(index_path)
+    with open(index_path, mode='a', encoding='utf-8') as f:
+        f.write(line)
+
+
+def get_recorded_spec_fieldnames(data_path: str) -> dict:
+    """Returns {relative filepath: fieldnames} from the spec fieldnames
+    index in data_path, latest record per file wins.
+
+    Lines left incomplete by an interrupted write are skipped.
+    """
+    index_path = os.path.join(data_path, SPEC_FIELDNAMES_FILENAME)
+    if not os.path.exists(index_path):
+        return dict()
+
+    recorded = dict()
+    with open(index_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            recorded[record['filepath']] = record['fieldnames']
+    return recorded
+
+
 def config(section: str, filename=CONFIG_FILE, ):
     """Returns parameters for given section of the config.ini file."""
     parser = ConfigParser()
@@ -141,3 +191,34 @@ def config(section: str, filename=CONFIG_FILE, ):
         raise Exception('Section {0} not found in the {1} file'.format(section, filename))
 
     return pars
+
+
+def scraper_settings(source: str, filename=CONFIG_FILE) -> dict:
+    """Returns scraper settings for given source.
+
+    Values in the [scraper] section of the config.ini file apply to all
+    sources and are overridden by values in the [scraper_<source>] section.
+    Settings missing from both fall back to SCRAPER_SETTINGS.
+    """
+    parser = ConfigParser()
+    parser.read(filename)
+
+    settings = dict(SCRAPER_SETTINGS)
+    for section in ['scraper', f'scraper_{source}']:
+        if not parser.has_section(section):
+            continue
+
+        for key, default in SCRAPER_SETTINGS.items():
+            if not parser.has_option(section, key):
+                continue
+
+            if isinstance(default, bool):
+                settings[key] = parser.getboolean(section, key)
+            elif isinstance(default, int):
+                settings[key] = parser.getint(section, key)
+            elif isinstance(default, float):
+                settings[key] = parser.getfloat(section, key)
+            else:
+                settings[key] = parser.get(section, key)
+
+    return settings